@@ -0,0 +1,213 @@
+"""
+Page and fragment caches.
+
+Pages are stored under keys that embed versions of the namespaces they
+depend on (the index, a category slug, an author username) and the
+publication epoch. Signals bump the versions of the namespaces touched by
+a change, which makes the old keys unreachable; they then expire.
+
+Pages older than PAGE_CACHE_TIMEOUT or outdated by a new version are
+rendered again by the single request that takes the lease of the new key.
+Meanwhile other requests get the previous copy, found through the latest
+key of the path, unless it is older than BLOG_PAGE_MAX_STALENESS seconds.
+Without such a copy they wait for the lease holder to store the page.
+
+Post cards are cached the same way, per post, with versions of the post,
+its author, category and location.
+
+Lookups of posts and authors that do not exist are remembered for a short
+time, until a post or user with that key is created. They have a small
+cache of their own, so requests for junk URLs cannot evict anything else.
+
+The last successful render of a path is kept much longer, without
+versions in its key, to be served when the database is unavailable.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.utils.connection import ConnectionProxy
+
+from . import metrics
+from .scheduling import publication_epoch
+from core.cache import initial_version, state_cache
+from core.consts import (
+    LAST_GOOD_PAGE_REFRESH, LAST_GOOD_PAGE_TIMEOUT, MISSING_CACHE_TIMEOUT,
+    PAGE_CACHE_TIMEOUT, PAGE_LEASE_TIMEOUT, PAGE_LEASE_WAIT
+)
+
+VERSION_PREFIX = 'blog:version:'
+PAGE_PREFIX = 'blog:page:'
+LATEST_PAGE_PREFIX = 'blog:page-latest:'
+PAGE_LEASE_PREFIX = 'blog:page-lease:'
+MISSING_PREFIX = 'blog:missing:'
+LAST_GOOD_PREFIX = 'blog:page-good:'
+LAST_GOOD_MARK_PREFIX = 'blog:page-good-mark:'
+MISSING_CACHE_ALIAS = 'missing'
+# Seconds between checks for the page rendered by the lease holder.
+PAGE_POLL_INTERVAL = 0.05
+
+missing_cache = ConnectionProxy(caches, MISSING_CACHE_ALIAS)
+
+
+def get_versions(namespaces):
+    keys = [VERSION_PREFIX + namespace for namespace in namespaces]
+    versions = state_cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            state_cache.add(key, initial_version(), None)
+            versions[key] = state_cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(namespaces):
+    for namespace in set(namespaces):
+        key = VERSION_PREFIX + namespace
+        if state_cache.add(key, initial_version(), None):
+            continue
+        try:
+            state_cache.incr(key)
+        except ValueError:
+            state_cache.add(key, initial_version(), None)
+
+
+def feed_namespaces(category_slugs=(), usernames=()):
+    """Namespaces of the feeds a post with these relations appears in"""
+    return [
+        'index',
+        *(f'category:{slug}' for slug in category_slugs if slug),
+        *(f'author:{username}' for username in usernames if username)
+    ]
+
+
+def path_hash(full_path):
+    return hashlib.md5(full_path.encode()).hexdigest()
+
+
+def page_key(view_name, namespaces, full_path):
+    versions = '.'.join(map(str, get_versions(namespaces)))
+    return (
+        f'{PAGE_PREFIX}{view_name}:{versions}:'
+        f'{publication_epoch()}:{path_hash(full_path)}'
+    )
+
+
+def latest_page_key(view_name, full_path):
+    """Key pointing to the last page key stored for the path"""
+    return f'{LATEST_PAGE_PREFIX}{view_name}:{path_hash(full_path)}'
+
+
+def card_namespaces(post):
+    """Namespaces of the rows rendered in the card of the post"""
+    return (
+        f'card:post:{post.pk}',
+        f'card:author:{post.author_id}',
+        f'card:category:{post.category_id}',
+        f'card:location:{post.location_id}'
+    )
+
+
+def attach_card_versions(posts):
+    """
+    Set card_version of every post, used to key its cached card.
+    Versions of the whole page are read in one cache round trip
+    """
+    namespaces = sorted({
+        namespace for post in posts for namespace in card_namespaces(post)
+    })
+    versions = dict(zip(namespaces, get_versions(namespaces)))
+    for post in posts:
+        post.card_version = '.'.join(
+            str(versions[namespace]) for namespace in card_namespaces(post)
+        )
+
+
+def page_timeout():
+    return PAGE_CACHE_TIMEOUT + settings.BLOG_PAGE_MAX_STALENESS
+
+
+def is_fresh(page):
+    return page is not None and time.time() - page[2] < PAGE_CACHE_TIMEOUT
+
+
+def get_page(key, latest_key):
+    """
+    Return content and validator headers of the page to serve, or None
+    when the request has to render the page and then call set_page()
+    or release_page()
+    """
+    page = cache.get(key)
+    if is_fresh(page):
+        metrics.incr('page_cache.hit')
+        return page[:2]
+    if state_cache.add(PAGE_LEASE_PREFIX + key, 1, PAGE_LEASE_TIMEOUT):
+        metrics.incr('page_cache.miss')
+        return None
+    if page is None:
+        latest = cache.get(latest_key)
+        if latest is not None:
+            page = cache.get(latest)
+    if page is not None:
+        staleness = time.time() - page[2]
+        if staleness <= settings.BLOG_PAGE_MAX_STALENESS:
+            metrics.incr('page_cache.stale')
+            metrics.incr('page_cache.stale_ms', int(staleness * 1000))
+            return page[:2]
+    # Another request is rendering the page and there is no copy to serve.
+    deadline = time.monotonic() + PAGE_LEASE_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(PAGE_POLL_INTERVAL)
+        page = cache.get(key)
+        if is_fresh(page):
+            metrics.incr('page_cache.coalesced')
+            return page[:2]
+    metrics.incr('page_cache.miss')
+    return None
+
+
+def set_page(key, latest_key, content, validators):
+    cache.set(key, (content, validators, time.time()), page_timeout())
+    cache.set(latest_key, key, page_timeout())
+    release_page(key)
+
+
+def release_page(key):
+    state_cache.delete(PAGE_LEASE_PREFIX + key)
+
+
+def missing_key(kind, value):
+    return f'{MISSING_PREFIX}{kind}:{value}'
+
+
+def is_missing(kind, value):
+    return missing_cache.get(missing_key(kind, value)) is not None
+
+
+def remember_missing(kind, value):
+    missing_cache.set(missing_key(kind, value), True, MISSING_CACHE_TIMEOUT)
+
+
+def forget_missing(kind, value):
+    missing_cache.delete(missing_key(kind, value))
+
+
+def last_good_key(view_name, path):
+    return f'{LAST_GOOD_PREFIX}{view_name}:{path_hash(path)}'
+
+
+def get_last_good_page(view_name, path):
+    """Content type and content of the last successful render, or None"""
+    return cache.get(last_good_key(view_name, path))
+
+
+def set_last_good_page(view_name, path, content_type, content):
+    """
+    Keep the render, at most once in LAST_GOOD_PAGE_REFRESH seconds
+    per path, so that pages rendered on every request are not rewritten
+    """
+    key = last_good_key(view_name, path)
+    if state_cache.add(
+        LAST_GOOD_MARK_PREFIX + key, 1, LAST_GOOD_PAGE_REFRESH
+    ):
+        cache.set(key, (content_type, content), LAST_GOOD_PAGE_TIMEOUT)
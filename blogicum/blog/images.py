@@ -0,0 +1,113 @@
+"""
+Thumbnails of post images.
+
+Every image gets copies scaled down to THUMBNAIL_WIDTHS, stored next to
+the original as <name>_<width>w<ext>. Widths not smaller than the original
+are skipped, the original is offered in their place. Templates list all
+of them in srcset, so browsers download the smallest one that fits.
+"""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from core.consts import THUMBNAIL_QUALITY, THUMBNAIL_WIDTHS
+
+# EXIF orientations that turn the image by 90 degrees.
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+EXIF_ORIENTATION = 0x0112
+
+
+def read_width(image):
+    """Width of the image as displayed, or None when it cannot be read"""
+    try:
+        with Image.open(image) as picture:
+            width, height = picture.size
+            orientation = picture.getexif().get(EXIF_ORIENTATION)
+    except (OSError, ValueError):
+        return None
+    return height if orientation in TRANSPOSED_ORIENTATIONS else width
+
+
+def thumbnail_name(name, width):
+    root, ext = os.path.splitext(name)
+    return f'{root}_{width}w{ext}'
+
+
+def thumbnail_widths(original_width):
+    if not original_width:
+        return ()
+    return tuple(width for width in THUMBNAIL_WIDTHS if width < original_width)
+
+
+def scale(picture, width, image_format):
+    picture = ImageOps.exif_transpose(picture)
+    if picture.mode == 'P':
+        picture = picture.convert('RGBA')
+    height = max(1, round(picture.height * width / picture.width))
+    thumbnail = picture.resize((width, height), Image.LANCZOS)
+    if image_format == 'JPEG' and thumbnail.mode not in ('RGB', 'L'):
+        thumbnail = thumbnail.convert('RGB')
+    content = BytesIO()
+    thumbnail.save(
+        content, image_format, quality=THUMBNAIL_QUALITY, optimize=True
+    )
+    return ContentFile(content.getvalue())
+
+
+def make_thumbnails(post):
+    """
+    Create the missing thumbnails of the post image, return their number,
+    or None when the image cannot be decoded
+    """
+    image = post.image
+    missing = [
+        width for width in thumbnail_widths(post.image_width)
+        if not image.storage.exists(thumbnail_name(image.name, width))
+    ]
+    created = 0
+    if not missing:
+        return created
+    try:
+        with image.storage.open(image.name) as original:
+            with Image.open(original) as picture:
+                image_format = picture.format
+                for width in missing:
+                    image.storage.save(
+                        thumbnail_name(image.name, width),
+                        scale(picture, width, image_format)
+                    )
+                    created += 1
+    except (OSError, ValueError):
+        # Truncated or corrupt uploads are shown as they are.
+        return None
+    return created
+
+
+def delete_thumbnails(storage, name):
+    for width in THUMBNAIL_WIDTHS:
+        storage.delete(thumbnail_name(name, width))
+
+
+def srcset(post):
+    """Value of the srcset attribute for the post image"""
+    image = post.image
+    candidates = [
+        f'{image.storage.url(thumbnail_name(image.name, width))} {width}w'
+        for width in thumbnail_widths(post.image_width)
+    ]
+    if post.image_width:
+        candidates.append(f'{image.url} {post.image_width}w')
+    return ', '.join(candidates)
+
+
+def src(post):
+    """Fallback for browsers without srcset: the largest card-sized copy"""
+    widths = [
+        width for width in thumbnail_widths(post.image_width)
+        if width <= THUMBNAIL_WIDTHS[1]
+    ]
+    if not widths:
+        return post.image.url
+    return post.image.storage.url(thumbnail_name(post.image.name, widths[-1]))
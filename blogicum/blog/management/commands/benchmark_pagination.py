@@ -0,0 +1,114 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from blog.mixins import PostPaginationMixin
+from blog.models import Category, Post
+from blog.registry import registry
+
+
+def plain_paginator(self, queryset, per_page, **kwargs):
+    return Paginator(queryset, per_page, **kwargs)
+
+
+# Name of the variant and the get_paginator() it uses, None for the
+# current CachedCountPaginator.
+PAGINATORS = {
+    'paginator': plain_paginator,
+    'cached': None,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare Paginator with CachedCountPaginator on ?page= requests '
+        'of the index. Creates a throwaway test database with the given '
+        'number of posts and keeps the configured caches untouched'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--page', type=int, action='append')
+        parser.add_argument('--requests', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            with override_settings(CACHES={
+                alias: {
+                    'BACKEND': (
+                        'django.core.cache.backends.locmem.LocMemCache'
+                    ),
+                    'LOCATION': f'benchmark-{alias}',
+                }
+                for alias in settings.CACHES
+            }):
+                client = self.prepare(options)
+                for name, get_paginator in PAGINATORS.items():
+                    for number in options['page'] or (1, 2, 50):
+                        result = self.run(
+                            client, get_paginator, number, options
+                        )
+                        self.stdout.write(f'{name}, page {number}: {result}')
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def prepare(self, options):
+        # Logged in requests skip the page cache, so every request
+        # paginates the feed.
+        user = get_user_model().objects.create_user('pagination-benchmark')
+        category = Category.objects.create(
+            title='Категория', description='Описание', slug='benchmark'
+        )
+        now = timezone.now()
+        created = 0
+        while created < options['posts']:
+            size = min(options['batch_size'], options['posts'] - created)
+            # Created in bulk: counters and caches are not involved.
+            Post.objects.bulk_create(
+                Post(
+                    title=f'Публикация {number}',
+                    text='Текст публикации',
+                    excerpt='Текст публикации',
+                    pub_date=now - timedelta(minutes=number),
+                    author=user,
+                    category=category
+                )
+                for number in range(created, created + size)
+            )
+            created += size
+        registry.refresh()
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+        return client
+
+    def run(self, client, get_paginator, number, options):
+        path = f'/?page={number}'
+        with mock.patch.object(
+            PostPaginationMixin, 'get_paginator',
+            get_paginator or PostPaginationMixin.get_paginator
+        ):
+            # The first request loads templates and fills the count cache.
+            client.get(path)
+            started = time.perf_counter()
+            errors = sum(
+                client.get(path).status_code >= 400
+                for _ in range(options['requests'])
+            )
+            elapsed = time.perf_counter() - started
+        return (
+            f'{elapsed / options["requests"] * 1000:.1f} ms per request, '
+            f'{errors} errors'
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog import metrics
+
+
+class Command(BaseCommand):
+    help = 'Print blog cache counters'
+
+    def handle(self, *args, **options):
+        for name, value in metrics.snapshot().items():
+            self.stdout.write(f'{name}: {value}')
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post, make_excerpt
+
+
+class Command(BaseCommand):
+    help = 'Compute Post.excerpt for posts saved before the field existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of posts loaded and updated at once.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        filled = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk).order_by(
+                    'pk'
+                ).only('pk', 'text', 'excerpt')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            changed = []
+            for post in batch:
+                excerpt = make_excerpt(post.text)
+                if post.excerpt != excerpt:
+                    post.excerpt = excerpt
+                    changed.append(post)
+            Post.objects.bulk_update(changed, ('excerpt',))
+            filled += len(changed)
+        self.stdout.write(f'Excerpts filled: {filled}')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.scheduling import get_frontier, publication_epoch
+
+
+class Command(BaseCommand):
+    help = (
+        'Announce scheduled posts whose time has come. '
+        'Run it from cron to fire posts_published without waiting for traffic'
+    )
+
+    def handle(self, *args, **options):
+        epoch = publication_epoch()
+        frontier = get_frontier()
+        self.stdout.write(
+            f'Publication epoch: {epoch}, next publication: '
+            f'{frontier.isoformat() if frontier else "none"}'
+        )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from blog.models import Post, actual_comment_count
+
+
+class Command(BaseCommand):
+    help = 'Fix drift between Post.comment_count and the comments table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of posts checked per query.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        fixed = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk).order_by(
+                    'pk'
+                ).values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1]
+            drifted = Post.objects.filter(
+                pk__in=batch
+            ).with_actual_comment_count().exclude(
+                comment_count=F('actual_comment_count')
+            ).values_list('pk', flat=True)
+            # Recount inside the UPDATE itself, so comments added while
+            # the batch was being checked are not lost.
+            fixed += Post.objects.filter(pk__in=list(drifted)).update(
+                comment_count=actual_comment_count()
+            )
+        self.stdout.write(f'Comment counts fixed: {fixed}')
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import make_thumbnails, read_width, thumbnail_name
+from blog.models import Post
+from core.consts import THUMBNAIL_WIDTHS
+
+
+class Command(BaseCommand):
+    help = (
+        'Create missing thumbnails of post images and fill Post.image_width '
+        'for posts saved before the field existed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of posts loaded at once.'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Replace existing thumbnails too.'
+        )
+
+    def handle(self, *args, batch_size, force, **options):
+        created = 0
+        measured = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk).exclude(
+                    image=''
+                ).order_by('pk')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for post in batch:
+                stored_width = post.image_width
+                post.image_width = read_width(post.image)
+                if force:
+                    for thumbnail_width in THUMBNAIL_WIDTHS:
+                        post.image.storage.delete(
+                            thumbnail_name(post.image.name, thumbnail_width)
+                        )
+                thumbnails = make_thumbnails(post)
+                if thumbnails is None:
+                    # Without a width templates show the original alone.
+                    post.image_width = None
+                else:
+                    created += thumbnails
+                if post.image_width != stored_width:
+                    # Saved one by one, so signals refresh cached pages.
+                    post.save(update_fields=('image_width',))
+                    measured += 1
+        self.stdout.write(
+            f'Image widths updated: {measured}, thumbnails created: {created}'
+        )
@@ -0,0 +1,37 @@
+"""
+Counters shared by all workers. They live in the state cache and reset
+together with it.
+"""
+from core.cache import state_cache
+
+PREFIX = 'blog:metrics:'
+
+NAMES = (
+    'page_cache.hit',
+    'page_cache.miss',
+    # Outdated copies served while another request renders the page, and
+    # their total age; the average tells how stale served pages are.
+    'page_cache.stale',
+    'page_cache.stale_ms',
+    # Requests that waited for another request to render the page.
+    'page_cache.coalesced',
+    # Last good pages served because the database failed, and failures
+    # of such requests that had no page to fall back to.
+    'degraded.served',
+    'degraded.missed',
+)
+
+
+def incr(name, delta=1):
+    key = PREFIX + name
+    state_cache.add(key, 0, None)
+    try:
+        state_cache.incr(key, delta)
+    except ValueError:
+        # Evicted between add() and incr().
+        state_cache.add(key, delta, None)
+
+
+def snapshot():
+    values = state_cache.get_many([PREFIX + name for name in NAMES])
+    return {name: values.get(PREFIX + name, 0) for name in NAMES}
@@ -0,0 +1,78 @@
+from django.db import DatabaseError
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import urlencode
+
+from . import cache, metrics
+
+# Pages that can be served from their last successful render.
+LAST_GOOD_VIEWS = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+)
+# Query parameters the views read; the rest does not change the page.
+PAGE_PARAMS = ('page', 'after', 'before')
+STALE_WARNING = '110 - "Response is Stale"'
+
+
+def view_name(request):
+    match = request.resolver_match
+    if request.method != 'GET' or match is None:
+        return None
+    if match.view_name not in LAST_GOOD_VIEWS:
+        return None
+    return match.view_name
+
+
+def page_path(request):
+    """Path of the request with only the parameters the views read"""
+    params = [
+        (name, request.GET[name])
+        for name in PAGE_PARAMS
+        if name in request.GET
+    ]
+    if not params:
+        return request.path
+    return f'{request.path}?{urlencode(params)}'
+
+
+class LastGoodPageMiddleware(MiddlewareMixin):
+    """
+    Keep the last page rendered for anonymous users and serve it with
+    a Warning header when the database fails, instead of a server error
+    """
+
+    def process_template_response(self, request, response):
+        # Pages served from the page cache are not rendered here, only
+        # new renders are kept.
+        name = view_name(request)
+        if name is not None and not request.user.is_authenticated:
+            response.add_post_render_callback(
+                lambda rendered: self.store_page(request, name, rendered)
+            )
+        return response
+
+    def store_page(self, request, name, response):
+        if response.status_code != 200:
+            return
+        cache.set_last_good_page(
+            name, page_path(request),
+            response['Content-Type'], response.content
+        )
+
+    def process_exception(self, request, exception):
+        name = view_name(request)
+        if name is None or not isinstance(exception, DatabaseError):
+            return None
+        page = cache.get_last_good_page(name, page_path(request))
+        if page is None:
+            metrics.incr('degraded.missed')
+            return None
+        metrics.incr('degraded.served')
+        content_type, content = page
+        response = HttpResponse(content, content_type=content_type)
+        response['Warning'] = STALE_WARNING
+        response['Cache-Control'] = 'no-store'
+        return response
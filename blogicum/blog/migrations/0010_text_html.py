@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:52
+
+from django.conf import settings
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr
+
+BATCH_SIZE = 1000
+
+
+def fill_text_html(apps, schema_editor):
+    if not settings.BLOG_TEXT_HTML:
+        return
+    for model_name in ('Comment', 'Post'):
+        Model = apps.get_model('blog', model_name)
+        batch = []
+        for instance in Model.objects.only('pk', 'text').iterator(
+            chunk_size=BATCH_SIZE
+        ):
+            instance.text_html = linebreaksbr(instance.text)
+            batch.append(instance)
+            if len(batch) == BATCH_SIZE:
+                Model.objects.bulk_update(batch, ('text_html',))
+                batch = []
+        Model.objects.bulk_update(batch, ('text_html',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_text_html, migrations.RunPython.noop),
+    ]
@@ -1,20 +1,65 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.shortcuts import get_object_or_404, redirect
+from django.http import Http404, HttpResponse
+from django.shortcuts import redirect
 
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 
+from . import cache
 from .forms import CommentForm, PostForm
 from .models import Comment, Post
+from .paginators import CachedCountPaginator, CursorPaginator, InvalidCursor
+from .registry import registry
+from .scheduling import publication_epoch
+from core.consts import CARD_CACHE_TIMEOUT
+
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+def not_modified(request, validators):
+    """Return 304 response if the request already has this version"""
+    response = get_conditional_response(
+        request,
+        etag=validators.get('ETag'),
+        last_modified=parse_http_date_safe(validators.get('Last-Modified'))
+    )
+    if response is not None:
+        set_validators(response, validators)
+    return response
+
+
+def set_validators(response, validators):
+    for name, value in validators.items():
+        response[name] = value
+
+
+class CachedObjectMixin:
+    """Load the object of the view at most once per request"""
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_object'):
+            self._object = self.fetch_object()
+        return self._object
+
+    def fetch_object(self):
+        return super().get_object()
 
 
-class CommentMixin:
+class CommentMixin(CachedObjectMixin):
     model = Comment
     form_class = CommentForm
     pk_url_kwarg = ['comment_id', 'post_id']
     template_name = 'blog/comment.html'
 
-    def get_object(self):
-        return get_object_or_404(Comment, pk=self.kwargs['comment_id'])
+    def get_lookup(self):
+        return {
+            'pk': self.kwargs['comment_id'],
+            'post_id': self.kwargs['post_id']
+        }
 
     def get_success_url(self):
         return reverse(
@@ -24,26 +69,179 @@ class CommentMixin:
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
+    """
+    Allow the view only to the author of its object.
+    The author is part of the lookup, so objects of other users
+    are never loaded: get_object() returns None for them
+    """
+
+    def fetch_object(self):
+        lookup = self.get_lookup()
+        try:
+            return self.model.objects.get(
+                author_id=self.request.user.pk, **lookup
+            )
+        except self.model.DoesNotExist:
+            if self.model.objects.filter(**lookup).exists():
+                return None
+            raise Http404('Объект не найден')
 
     def test_func(self):
-        object = self.get_object()
-        return object.author == self.request.user
+        return self.get_object() is not None
 
     def handle_no_permission(self):
         return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
 
 
-class PostMixin:
+class PostMixin(CachedObjectMixin):
     model = Post
     form_class = PostForm
     pk_url_kwarg = 'post_id'
 
-    def get_object(self):
-        return get_object_or_404(
-            Post,
-            pk=self.kwargs['post_id']
-        )
+    def get_lookup(self):
+        return {'pk': self.kwargs['post_id']}
 
     def form_valid(self, form):
         form.instance.author = self.request.user
         return super().form_valid(form)
+
+
+class PostPaginationMixin:
+    """
+    Paginate posts by ?page= numbers or by ?after=/?before= cursors.
+    Cursors are used when requested or when BLOG_CURSOR_PAGINATION is on
+    """
+
+    paginator_class = CachedCountPaginator
+
+    def get_count_key(self):
+        """Cache key for the number of posts, None disables count caching"""
+        return None
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, count_key=self.get_count_key(), **kwargs
+        )
+
+    def uses_cursor(self):
+        params = self.request.GET
+        if 'after' in params or 'before' in params:
+            return True
+        return settings.BLOG_CURSOR_PAGINATION and 'page' not in params
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before')
+            )
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AnonymousPageCacheMixin:
+    """
+    Serve GET requests of anonymous users from the page cache.
+    Pages are keyed by view, cache namespaces and the full path
+    """
+
+    def get_cache_namespaces(self):
+        return ('index',)
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        view_name = request.resolver_match.view_name
+        full_path = request.get_full_path()
+        key = cache.page_key(
+            view_name, self.get_cache_namespaces(), full_path
+        )
+        latest_key = cache.latest_page_key(view_name, full_path)
+        page = cache.get_page(key, latest_key)
+        if page is not None:
+            content, validators = page
+            response = not_modified(request, validators)
+            if response is None:
+                response = HttpResponse(content)
+                set_validators(response, validators)
+        else:
+            try:
+                response = super().get(request, *args, **kwargs)
+            except BaseException:
+                cache.release_page(key)
+                raise
+            if response.status_code == 200:
+                response.add_post_render_callback(
+                    lambda rendered: self.store_page(key, latest_key, rendered)
+                )
+            else:
+                cache.release_page(key)
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    def store_page(self, key, latest_key, response):
+        cache.set_page(key, latest_key, response.content, {
+            name: response[name]
+            for name in VALIDATOR_HEADERS
+            if response.has_header(name)
+        })
+
+
+def validator_headers(request, state, last_modified=None):
+    """
+    Return ETag of the state as seen by the user of the request, and
+    Last-Modified when it is known
+    """
+    user = request.user
+    etag = hashlib.md5(repr((
+        state,
+        user.pk,
+        user.get_username(),
+        request.META.get('CSRF_COOKIE'),
+        request.get_full_path()
+    )).encode()).hexdigest()
+    validators = {'ETag': quote_etag(etag)}
+    if last_modified is not None:
+        validators['Last-Modified'] = http_date(last_modified.timestamp())
+    return validators
+
+
+class FeedConditionalGetMixin:
+    """
+    Answer GET requests of feeds with 304 Not Modified when the page did
+    not change. Feeds are described by the versions of their cache
+    namespaces, the publication epoch and the posts of the page, so the
+    validators are computed from the loaded page right before rendering
+    """
+
+    def get_validators(self, context):
+        return (
+            cache.get_versions(self.get_cache_namespaces()),
+            publication_epoch(),
+            [(post.pk, post.updated_at) for post in context['page_obj']]
+        )
+
+    def render_to_response(self, context, **response_kwargs):
+        validators = validator_headers(
+            self.request, self.get_validators(context)
+        )
+        response = not_modified(self.request, validators)
+        if response is None:
+            response = super().render_to_response(context, **response_kwargs)
+            set_validators(response, validators)
+        return response
+
+
+class PostCardCacheMixin:
+    """Prepare posts of the page to be shown and cached as cards"""
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        registry.attach(context['page_obj'])
+        cache.attach_card_versions(context['page_obj'])
+        context['card_cache_timeout'] = CARD_CACHE_TIMEOUT
+        return context
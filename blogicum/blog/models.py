@@ -1,8 +1,17 @@
 from django.contrib.auth import get_user_model
-from django.db import models
-
-from core.consts import MAX_LENGTH
-from core.models import BaseModel, BaseModelPublished
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from .images import (
+    delete_thumbnails, make_thumbnails, read_width, src, srcset
+)
+from core.consts import EXCERPT_WORDS, MAX_LENGTH
+from core.models import (
+    BaseModel, BaseModelPublished, BaseModelRenderedText
+)
 
 User = get_user_model()
 
@@ -30,7 +39,7 @@ class Category(BaseModelPublished):
         return self.title
 
 
-class Comment(BaseModel):
+class Comment(BaseModelRenderedText, BaseModel):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     post = models.ForeignKey(
         'Post',
@@ -41,6 +50,12 @@ class Comment(BaseModel):
 
     class Meta:
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'
+            ),
+        )
 
 
 class Location(BaseModelPublished):
@@ -57,12 +72,68 @@ class Location(BaseModelPublished):
         return self.name
 
 
-class Post(BaseModelPublished):
+def make_excerpt(text):
+    """Beginning of the post shown on cards instead of the full text"""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def actual_comment_count():
+    """Correlated subquery counting comments of the outer post"""
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(
+                post=OuterRef('pk')
+            ).order_by().values('post').annotate(
+                count=Count('pk')
+            ).values('count')
+        ),
+        0
+    )
+
+
+class PostQuerySet(models.QuerySet):
+
+    @staticmethod
+    def published_q():
+        """
+        Condition for posts visible to everyone: published,
+        in a published category and not deferred
+        """
+        return Q(
+            category__is_published=True,
+            is_published=True,
+            pub_date__lte=timezone.now()
+        )
+
+    def published(self):
+        return self.filter(self.published_q())
+
+    def visible_to(self, user):
+        """Published posts plus all posts of the given user"""
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(self.published_q() | Q(author_id=user.pk))
+
+    def for_cards(self):
+        """
+        Load posts with authors for includes/post_card.html, categories
+        and locations are attached from blog.registry.
+        Cards show the excerpt, so the full text is left in the database
+        """
+        return self.select_related('author').defer('text', 'text_html')
+
+    def with_actual_comment_count(self):
+        """Annotate the number of comments counted in the comments table"""
+        return self.annotate(actual_comment_count=actual_comment_count())
+
+
+class Post(BaseModelRenderedText, BaseModelPublished):
     title = models.CharField(
         'Заголовок',
         max_length=MAX_LENGTH
     )
     text = models.TextField('Текст')
+    excerpt = models.TextField('Отрывок', blank=True, editable=False)
     pub_date = models.DateTimeField(
         'Дата и время публикации',
         help_text=(
@@ -89,9 +160,84 @@ class Post(BaseModelPublished):
         verbose_name='Категория'
     )
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    image_width = models.PositiveIntegerField(
+        'Ширина фото',
+        null=True,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        'Комментарии',
+        default=0,
+        editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         default_related_name = 'posts'
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('is_published', 'pub_date'),
+                name='post_published_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                name='post_category_pub_date_idx'
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=Q(is_published=True),
+                name='post_pub_date_if_published_idx'
+            ),
+        )
+
+    def loaded_image_name(self):
+        image = getattr(self, '_loaded_values', {}).get('image')
+        return getattr(image, 'name', image)
+
+    def image_changed(self):
+        if 'image' not in self.__dict__:
+            return False
+        return self.loaded_image_name() != self.image.name
+
+    def image_src(self):
+        return src(self)
+
+    def image_srcset(self):
+        return srcset(self)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if self.text_changed():
+            self.excerpt = make_excerpt(self.text)
+            if update_fields is not None and 'text' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        image_changed = self.image_changed()
+        old_image_name = self.loaded_image_name()
+        if image_changed:
+            self.image_width = read_width(self.image) if self.image else None
+            if update_fields is not None and 'image' in update_fields:
+                kwargs['update_fields'] = {
+                    *kwargs['update_fields'], 'image_width'
+                }
+        super().save(*args, **kwargs)
+        if image_changed and old_image_name:
+            storage = self.image.storage
+            if old_image_name == self.image.name:
+                # The new image took the name of the old one.
+                delete_thumbnails(storage, old_image_name)
+            else:
+                transaction.on_commit(
+                    lambda: delete_thumbnails(storage, old_image_name)
+                )
+        if image_changed and self.image and make_thumbnails(self) is None:
+            # Without a width templates show the original alone.
+            self.image_width = None
+            type(self).objects.filter(pk=self.pk).update(image_width=None)
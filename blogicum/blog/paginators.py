@@ -0,0 +1,170 @@
+import base64
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from core.consts import COMMENTS_ON_PAGE, POST_COUNT_CACHE_TIMEOUT
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def post_count_key(*parts):
+    return ':'.join(('blog', 'post-count', *map(str, parts)))
+
+
+def encode_cursor(moment, pk):
+    raw = f'{moment.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        moment, pk = raw.decode().split('|')
+        return datetime.fromisoformat(moment), int(pk)
+    except (TypeError, ValueError) as error:
+        raise InvalidCursor(token) from error
+
+
+def comment_batch(comments, after=None, per_page=COMMENTS_ON_PAGE):
+    """
+    Comments following the cursor in (created_at, id) order
+    and the cursor of the next batch, None for the last one
+    """
+    if after is not None:
+        created_at, pk = decode_cursor(after)
+        comments = comments.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+        )
+    batch = list(comments.order_by('created_at', 'pk')[:per_page + 1])
+    if len(batch) <= per_page:
+        return batch, None
+    last = batch[per_page - 1]
+    return batch[:per_page], encode_cursor(last.created_at, last.pk)
+
+
+class CursorPage(Sequence):
+    """Page of posts addressed by opaque ?after= and ?before= tokens"""
+
+    is_cursor_page = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} posts>'
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next() and self.object_list:
+            return self.paginator.cursor_for(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous() and self.object_list:
+            return self.paginator.cursor_for(self.object_list[0])
+
+
+class CursorPaginator:
+    """
+    Keyset paginator over (pub_date, id), newest first.
+    Every page is a single indexed range query without OFFSET or COUNT
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    @staticmethod
+    def cursor_for(post):
+        return encode_cursor(post.pub_date, post.pk)
+
+    def page(self, after=None, before=None):
+        if before is not None:
+            pub_date, pk = decode_cursor(before)
+            rows = list(
+                self.queryset.filter(
+                    Q(pub_date__gt=pub_date)
+                    | Q(pub_date=pub_date, pk__gt=pk)
+                ).order_by('pub_date', 'pk')[:self.per_page + 1]
+            )
+            has_previous = len(rows) > self.per_page
+            object_list = rows[:self.per_page][::-1]
+            return CursorPage(object_list, self, True, has_previous)
+        queryset = self.queryset.order_by('-pub_date', '-pk')
+        if after is not None:
+            pub_date, pk = decode_cursor(after)
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )
+        rows = list(queryset[:self.per_page + 1])
+        return CursorPage(
+            rows[:self.per_page],
+            self,
+            len(rows) > self.per_page,
+            after is not None
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that takes the number of objects from the cache
+    and counts them in the database only when the cached value is missing
+    """
+
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        count = cache.get(self.count_key)
+        if count is None:
+            count = self.refresh_count()
+        return count
+
+    def refresh_count(self):
+        count = Paginator.count.func(self)
+        if self.count_key is not None:
+            cache.set(self.count_key, count, POST_COUNT_CACHE_TIMEOUT)
+        self.__dict__.update(count=count)
+        self.__dict__.pop('num_pages', None)
+        return count
+
+    def page(self, number):
+        page = super().page(number)
+        page.object_list = list(page.object_list)
+        bottom = (page.number - 1) * self.per_page
+        expected_length = min(self.per_page, self.count - bottom)
+        if len(page.object_list) < expected_length:
+            # Posts were removed since the count was cached and this page
+            # came out short or empty: recount and paginate again.
+            self.refresh_count()
+            page = super().page(number)
+        return page
@@ -0,0 +1,92 @@
+"""
+Process-local registry of categories and locations.
+
+Both tables are small and rarely change, so every process keeps them in
+memory instead of joining them to every post query. Signals bump a shared
+version in the cache once the change is committed, and a process reloads
+its registry when it sees a version it has not loaded yet, or when its
+copy is older than REGISTRY_TIMEOUT seconds. Only the first
+REGISTRY_MAX_SIZE rows of a table are kept; lookups of the others fall
+back to the database.
+"""
+import threading
+import time
+
+from .cache import get_versions
+from .models import Category, Location
+from core.consts import REGISTRY_MAX_SIZE, REGISTRY_TIMEOUT
+
+NAMESPACE = 'registry'
+
+
+class Registry:
+    """Categories by id and slug and locations by id"""
+
+    def __init__(self, max_size=REGISTRY_MAX_SIZE, timeout=REGISTRY_TIMEOUT):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._version = None
+        self._expires_at = 0
+        self._categories = {}
+        self._category_slugs = {}
+        self._locations = {}
+        self._complete = {Category: False, Location: False}
+
+    def _load(self, model):
+        objects = list(model.objects.order_by('pk')[:self.max_size + 1])
+        self._complete[model] = len(objects) <= self.max_size
+        return {obj.pk: obj for obj in objects[:self.max_size]}
+
+    def _is_current(self, version):
+        return version == self._version and time.monotonic() < self._expires_at
+
+    def refresh(self):
+        """Reload the registry, if categories or locations have changed"""
+        version = get_versions((NAMESPACE,))[0]
+        if self._is_current(version):
+            return
+        with self._lock:
+            if self._is_current(version):
+                return
+            self._categories = self._load(Category)
+            self._category_slugs = {
+                category.slug: category
+                for category in self._categories.values()
+            }
+            self._locations = self._load(Location)
+            self._version = version
+            self._expires_at = time.monotonic() + self.timeout
+
+    def category_by_slug(self, slug):
+        self.refresh()
+        category = self._category_slugs.get(slug)
+        if category is None and not self._complete[Category]:
+            category = Category.objects.filter(slug=slug).first()
+        return category
+
+    def _in_bulk(self, model, loaded, ids):
+        found = {pk: loaded[pk] for pk in ids if pk in loaded}
+        missing = set(ids) - found.keys() - {None}
+        if missing and not self._complete[model]:
+            found.update(model.objects.in_bulk(missing))
+        return found
+
+    def attach(self, posts):
+        """Set categories and locations of the posts without SQL joins"""
+        self.refresh()
+        categories = self._in_bulk(
+            Category, self._categories, {post.category_id for post in posts}
+        )
+        locations = self._in_bulk(
+            Location, self._locations, {post.location_id for post in posts}
+        )
+        for post in posts:
+            # Relations missing from both stay lazy and load on access.
+            if post.category_id in categories:
+                post.category = categories[post.category_id]
+            if post.location_id in locations:
+                post.location = locations[post.location_id]
+
+
+registry = Registry()
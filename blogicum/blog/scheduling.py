@@ -0,0 +1,84 @@
+"""
+Deferred publication of posts.
+
+Posts with a future pub_date go live without any write to the database,
+so nothing invalidates caches at that moment. The scheduler keeps the
+earliest upcoming pub_date (the frontier) in the cache and a publication
+epoch that is bumped exactly when the frontier is passed. Caches keyed on
+publication_epoch() stay valid between publish events.
+"""
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Post
+from core.cache import initial_version, state_cache
+
+EPOCH_KEY = 'blog:publication:epoch'
+FRONTIER_KEY = 'blog:publication:frontier'
+LOCK_KEY = 'blog:publication:lock'
+LOCK_TIMEOUT = 60
+NOTHING_SCHEDULED = 'nothing'
+
+# Sent once per publish event with the posts that went live and new epoch.
+posts_published = Signal()
+
+
+def next_publication_time():
+    """Earliest pub_date of published posts that is still in the future"""
+    return Post.objects.filter(
+        is_published=True,
+        pub_date__gt=timezone.now()
+    ).order_by('pub_date').values_list('pub_date', flat=True).first()
+
+
+def refresh_frontier():
+    frontier = next_publication_time()
+    state_cache.set(
+        FRONTIER_KEY,
+        NOTHING_SCHEDULED if frontier is None else frontier,
+        None
+    )
+    return frontier
+
+
+def get_frontier():
+    frontier = state_cache.get(FRONTIER_KEY)
+    if frontier is None:
+        return refresh_frontier()
+    if frontier == NOTHING_SCHEDULED:
+        return None
+    return frontier
+
+
+def publication_epoch():
+    """Number that changes only when scheduled posts go live"""
+    frontier = get_frontier()
+    if frontier is not None and frontier <= timezone.now():
+        publish_due(frontier)
+    epoch = state_cache.get(EPOCH_KEY)
+    if epoch is None:
+        # Restarts from the current time, past every epoch used before.
+        state_cache.add(EPOCH_KEY, initial_version(), None)
+        epoch = state_cache.get(EPOCH_KEY)
+    return epoch
+
+
+def publish_due(frontier):
+    """Advance the epoch past the frontier and announce the new posts"""
+    # Every worker notices the same frontier; only one of them publishes.
+    lock_key = f'{LOCK_KEY}:{frontier.isoformat()}'
+    if not state_cache.add(lock_key, 1, LOCK_TIMEOUT):
+        return
+    now = timezone.now()
+    state_cache.add(EPOCH_KEY, initial_version(), None)
+    epoch = state_cache.incr(EPOCH_KEY)
+    refresh_frontier()
+    posts_published.send(
+        sender=Post,
+        posts=Post.objects.filter(
+            is_published=True,
+            pub_date__gte=frontier,
+            pub_date__lte=now
+        ),
+        epoch=epoch
+    )
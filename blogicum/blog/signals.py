@@ -0,0 +1,233 @@
+from threading import local
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_versions, feed_namespaces, forget_missing
+from .images import delete_thumbnails
+from .models import Category, Comment, Location, Post, User
+from .paginators import post_count_key
+from .registry import NAMESPACE as REGISTRY_NAMESPACE
+from .scheduling import posts_published, refresh_frontier
+
+
+# Namespaces waiting for the commit and posts being deleted, per thread.
+pending = local()
+
+
+def bump_on_commit(namespaces):
+    """
+    Bump versions once the transaction commits. Bumped earlier, they let
+    other workers cache rows not committed yet under the new versions.
+    Namespaces of one transaction are bumped together, in one call
+    """
+    queued = getattr(pending, 'bump', None)
+    if queued is not None and any(
+        callback is queued[0]
+        for _, callback in transaction.get_connection().run_on_commit
+    ):
+        queued[1].update(namespaces)
+        return
+    namespaces = set(namespaces)
+
+    def bump():
+        pending.bump = None
+        bump_versions(namespaces)
+
+    pending.bump = (bump, namespaces)
+    transaction.on_commit(bump)
+
+
+def deleted_posts():
+    """Ids of posts being deleted, their comments go along with them"""
+    if not hasattr(pending, 'deleted_posts'):
+        pending.deleted_posts = set()
+    return pending.deleted_posts
+
+
+def change_comment_count(post_id, delta):
+    """Shift the stored counter in SQL, so concurrent writers don't race"""
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(
+        comment_count=F('comment_count') + delta,
+        updated_at=timezone.now()
+    )
+
+
+def touch_posts(posts):
+    """Mark posts as changed, when something shown on their pages changed"""
+    posts.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    loaded_values = getattr(instance, '_loaded_values', {})
+    if created:
+        change_comment_count(instance.post_id, 1)
+    elif loaded_values.get('post_id', instance.post_id) != instance.post_id:
+        change_comment_count(loaded_values['post_id'], -1)
+        change_comment_count(instance.post_id, 1)
+    else:
+        # Detail pages show the comments themselves.
+        touch_posts(Post.objects.filter(pk=instance.post_id))
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if instance.post_id not in deleted_posts():
+        change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    if instance.post_id in deleted_posts():
+        # Feeds of the post are refreshed once, when it is deleted.
+        return
+    # Cards show the number of comments of the post.
+    post_ids = {
+        instance.post_id,
+        getattr(instance, '_loaded_values', {}).get('post_id')
+    }
+    bump_post_feeds(Post.objects.filter(pk__in=post_ids))
+
+
+def bump_post_feeds(posts):
+    """Invalidate cached pages of every feed showing these posts"""
+    relations = list(
+        posts.order_by().values_list(
+            'category__slug', 'author__username'
+        ).distinct()
+    )
+    bump_on_commit(feed_namespaces(
+        {slug for slug, _ in relations},
+        {username for _, username in relations}
+    ))
+
+
+def forget_post_counts(category_ids, author_ids):
+    keys = {post_count_key('index')}
+    for category_id in category_ids:
+        keys.add(post_count_key('category', category_id))
+    for author_id in author_ids:
+        keys.add(post_count_key('author', author_id, 'own'))
+        keys.add(post_count_key('author', author_id, 'public'))
+    cache.delete_many(keys)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    loaded_values = getattr(instance, '_loaded_values', {})
+    category_ids = {instance.category_id, loaded_values.get('category_id')}
+    author_ids = {instance.author_id, loaded_values.get('author_id')}
+    forget_post_counts(category_ids, author_ids)
+    refresh_frontier()
+    bump_on_commit((f'card:post:{instance.pk}',))
+    if kwargs.get('created'):
+        forget_missing('post', instance.pk)
+    bump_on_commit(feed_namespaces(
+        Category.objects.filter(pk__in=category_ids).values_list(
+            'slug', flat=True
+        ),
+        User.objects.filter(pk__in=author_ids).values_list(
+            'username', flat=True
+        )
+    ))
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    deleted_posts().add(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    deleted_posts().discard(instance.pk)
+    image = instance.image
+    if image:
+        transaction.on_commit(
+            lambda: delete_thumbnails(image.storage, image.name)
+        )
+
+
+@receiver(posts_published)
+def scheduled_posts_published(sender, posts, **kwargs):
+    published = list(posts.values_list('category_id', 'author_id'))
+    forget_post_counts(
+        {category_id for category_id, _ in published},
+        {author_id for _, author_id in published}
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    cache.delete_many(
+        (post_count_key('index'), post_count_key('category', instance.pk))
+    )
+    bump_on_commit((f'card:category:{instance.pk}', REGISTRY_NAMESPACE))
+    bump_on_commit(feed_namespaces(
+        {instance.slug, getattr(instance, '_loaded_values', {}).get('slug')},
+        User.objects.filter(posts__category=instance).values_list(
+            'username', flat=True
+        ).distinct()
+    ))
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def location_changed(sender, instance, **kwargs):
+    bump_on_commit((f'card:location:{instance.pk}', REGISTRY_NAMESPACE))
+    bump_post_feeds(Post.objects.filter(location=instance))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+def relation_deleted(sender, instance, **kwargs):
+    # Posts lose the relation in SQL, without being saved: after that
+    # their feeds cannot be found by the relation.
+    posts = Post.objects.filter(**{sender._meta.model_name: instance})
+    bump_post_feeds(posts)
+    touch_posts(posts)
+
+
+def only_last_login(update_fields):
+    return update_fields is not None and set(update_fields) <= {'last_login'}
+
+
+@receiver(pre_save, sender=User)
+def user_saving(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or only_last_login(update_fields):
+        return
+    # Pages cached under the old username are dropped too.
+    instance._loaded_username = User.objects.filter(
+        pk=instance.pk
+    ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    if only_last_login(update_fields):
+        return
+    usernames = {instance.username}
+    loaded_username = getattr(instance, '_loaded_username', None)
+    if loaded_username is not None:
+        usernames.add(loaded_username)
+    for username in usernames:
+        forget_missing('author', username)
+    # Profile pages show the user, cards show the username of the author.
+    bump_on_commit((f'card:author:{instance.pk}',))
+    bump_on_commit(feed_namespaces(usernames=usernames))
+    bump_post_feeds(Post.objects.filter(author=instance))
+    touch_posts(Post.objects.filter(
+        Q(author=instance) | Q(comments__author=instance)
+    ))
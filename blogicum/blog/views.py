@@ -1,42 +1,59 @@
-from datetime import datetime
-
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404, redirect
+from django.http import Http404
+from django.shortcuts import redirect
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView
 )
 from django.urls import reverse
 
+from . import cache
 from .forms import CommentForm, PostForm, UserForm
-from .mixins import CommentMixin, OnlyAuthorMixin, PostMixin
+from .mixins import (
+    AnonymousPageCacheMixin, CachedObjectMixin, CommentMixin,
+    FeedConditionalGetMixin, OnlyAuthorMixin, PostCardCacheMixin, PostMixin,
+    PostPaginationMixin, not_modified, set_validators, validator_headers
+)
 from .models import Category, Comment, Post, User
+from .paginators import InvalidCursor, comment_batch, post_count_key
+from .registry import registry
 from core.consts import POSTS_ON_PAGE
 
 
-def published_objects():
-    return Post.objects.filter(
-        category__is_published=True,
-        is_published=True,
-        pub_date__lte=datetime.now()
-    )
-
-
-class ProfileListView(ListView):
+class ProfileListView(
+    AnonymousPageCacheMixin, CachedObjectMixin, FeedConditionalGetMixin,
+    PostCardCacheMixin, PostPaginationMixin, ListView
+):
     """Display profile's posts and information about profile"""
 
     model = User
     template_name = 'blog/profile.html'
     paginate_by = POSTS_ON_PAGE
 
-    def get_object(self):
-        return get_object_or_404(User, username=self.kwargs['username'])
+    def fetch_object(self):
+        username = self.kwargs['username']
+        if cache.is_missing('author', username):
+            raise Http404('Пользователь не найден')
+        profile = User.objects.filter(username=username).first()
+        if profile is None:
+            cache.remember_missing('author', username)
+            raise Http404('Пользователь не найден')
+        return profile
 
     def get_queryset(self):
-        if self.request.user == self.get_object():
-            page_obj = Post.objects.filter(author=self.get_object())
-        else:
-            page_obj = published_objects().filter(author=self.get_object())
-        return page_obj
+        return Post.objects.visible_to(self.request.user).filter(
+            author=self.get_object()
+        ).for_cards()
+
+    def get_cache_namespaces(self):
+        return (f'author:{self.kwargs["username"]}',)
+
+    def get_count_key(self):
+        profile = self.get_object()
+        return post_count_key(
+            'author',
+            profile.pk,
+            'own' if self.request.user == profile else 'public'
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -64,7 +81,10 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class CategoryListView(ListView):
+class CategoryListView(
+    AnonymousPageCacheMixin, CachedObjectMixin, FeedConditionalGetMixin,
+    PostCardCacheMixin, PostPaginationMixin, ListView
+):
     """
     Display category's posts except deferred and unpublished
     and information about category
@@ -74,16 +94,22 @@ class CategoryListView(ListView):
     paginate_by = POSTS_ON_PAGE
     template_name = 'blog/category.html'
 
-    def get_object(self):
-        return get_object_or_404(
-            Category,
-            is_published=True,
-            slug=self.kwargs['slug']
-        )
+    def fetch_object(self):
+        category = registry.category_by_slug(self.kwargs['slug'])
+        if category is None or not category.is_published:
+            raise Http404('Категория не найдена')
+        return category
 
     def get_queryset(self):
-        page_obj = published_objects().filter(category=self.get_object())
-        return page_obj
+        return Post.objects.published().filter(
+            category=self.get_object()
+        ).for_cards()
+
+    def get_cache_namespaces(self):
+        return (f'category:{self.kwargs["slug"]}',)
+
+    def get_count_key(self):
+        return post_count_key('category', self.get_object().pk)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -91,7 +117,10 @@ class CategoryListView(ListView):
         return context
 
 
-class PostListView(ListView):
+class PostListView(
+    AnonymousPageCacheMixin, FeedConditionalGetMixin, PostCardCacheMixin,
+    PostPaginationMixin, ListView
+):
     """Display all posts on main except deferred and unpublished"""
 
     model = Post
@@ -99,8 +128,10 @@ class PostListView(ListView):
     template_name = 'blog/index.html'
 
     def get_queryset(self):
-        page_obj = published_objects().all()
-        return page_obj
+        return Post.objects.published().for_cards()
+
+    def get_count_key(self):
+        return post_count_key('index')
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -121,7 +152,7 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostDetailView(DetailView):
+class PostDetailView(CachedObjectMixin, DetailView):
     """
     Display post with comments and information.
     Is available only for author if it is deffered or unpublished
@@ -132,30 +163,58 @@ class PostDetailView(DetailView):
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
-    def get_object(self):
-        post_instance = get_object_or_404(
-            Post,
-            pk=self.kwargs['post_id']
-        )
-        if post_instance.author == self.request.user:
-            return post_instance
-        else:
-            return get_object_or_404(
-                Post,
-                pk=self.kwargs['post_id'],
-                is_published=True,
-                pub_date__lte=datetime.now()
-            )
+    def fetch_object(self):
+        post_id = self.kwargs['post_id']
+        if cache.is_missing('post', post_id):
+            raise Http404('Публикация не найдена')
+        post = Post.objects.visible_to(self.request.user).select_related(
+            'author'
+        ).filter(pk=post_id).first()
+        if post is None:
+            # Hidden posts are not remembered, they may become visible.
+            if not Post.objects.filter(pk=post_id).exists():
+                cache.remember_missing('post', post_id)
+            raise Http404('Публикация не найдена')
+        registry.attach((post,))
+        return post
+
+    def get(self, request, *args, **kwargs):
+        # Validators come from the post lookup, before the page is rendered.
+        # Comments and users shown on the page touch the post on change.
+        post = self.get_object()
+        moments = [post.updated_at] + [
+            relation.updated_at
+            for relation in (post.category, post.location)
+            if relation is not None
+        ]
+        validators = validator_headers(request, moments, max(moments))
+        response = not_modified(request, validators)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code == 200:
+                set_validators(response, validators)
+        return response
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['post'] = self.get_object()
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        try:
+            context['comments'], context['comments_next'] = comment_batch(
+                self.object.comments.select_related('author'),
+                after=self.request.GET.get('after')
+            )
+        except InvalidCursor:
+            raise Http404('Неверный курсор комментариев')
         return context
 
 
-class PostUpdateView(PostMixin, OnlyAuthorMixin, UpdateView):
+class PostCommentsView(PostDetailView):
+    """Display next batch of post comments for the "load more" link"""
+
+    template_name = 'includes/comment_list.html'
+
+
+class PostUpdateView(OnlyAuthorMixin, PostMixin, UpdateView):
     """Edit post. Is available only for it's author"""
 
     template_name = 'blog/create.html'
@@ -167,7 +226,7 @@ class PostUpdateView(PostMixin, OnlyAuthorMixin, UpdateView):
         )
 
 
-class PostDeleteView(PostMixin, OnlyAuthorMixin, DeleteView):
+class PostDeleteView(OnlyAuthorMixin, PostMixin, DeleteView):
     """Delete post. Is available only for it's author"""
 
     template_name = 'blog/create.html'
@@ -180,36 +239,41 @@ class PostDeleteView(PostMixin, OnlyAuthorMixin, DeleteView):
 
 
 class CommentCreateView(LoginRequiredMixin, CreateView):
-    """Add comment. Is available only for logged in users"""
+    """
+    Add comment. Is available only for logged in users
+    and only to posts they can see
+    """
 
     model = Comment
     form_class = CommentForm
-    post_instance = None
     template_name = 'blog/comment.html'
 
     def dispatch(self, request, *args, **kwargs):
-        self.post_instance = get_object_or_404(Post, pk=kwargs['post_id'])
+        if not Post.objects.visible_to(request.user).filter(
+            pk=kwargs['post_id']
+        ).exists():
+            raise Http404('Публикация не найдена')
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = self.post_instance
+        form.instance.post_id = self.kwargs['post_id']
         return super().form_valid(form)
 
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
-            kwargs={'post_id': self.post_instance.pk}
+            kwargs={'post_id': self.kwargs['post_id']}
         )
 
 
-class CommentUpdateView(CommentMixin, OnlyAuthorMixin, UpdateView):
+class CommentUpdateView(OnlyAuthorMixin, CommentMixin, UpdateView):
     """Edit comment. Is available only for it's author"""
 
     pass
 
 
-class CommentDeleteView(CommentMixin, OnlyAuthorMixin, DeleteView):
+class CommentDeleteView(OnlyAuthorMixin, CommentMixin, DeleteView):
     """Delete comment. Is available only for it's author"""
 
     pass
@@ -1,11 +1,13 @@
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
+# Quick-start development settings - unsuitable for production,
+# which uses settings_prod on top of them
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -49,12 +51,25 @@ INTERNAL_IPS = [
 
 LOGIN_REDIRECT_URL = 'blog:index'
 
+# Paginate post lists with ?after=/?before= cursors instead of page numbers.
+# Old ?page= links keep working either way.
+BLOG_CURSOR_PAGINATION = False
+
+# Store the HTML of post and comment texts when they are saved instead of
+# formatting them on every render.
+BLOG_TEXT_HTML = True
+
+# Oldest age, in seconds, of a cached page served to anonymous visitors
+# while another request renders its new version.
+BLOG_PAGE_MAX_STALENESS = 600
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.CachedAuthenticationMiddleware',
+    'blog.middleware.LastGoodPageMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware'
 ]
@@ -79,6 +94,72 @@ TEMPLATES = [
     },
 ]
 
+# Cache files live outside the source tree, by default in the system
+# temporary directory.
+CACHE_DIR = Path(os.environ.get(
+    'BLOGICUM_CACHE_DIR', Path(tempfile.gettempdir()) / 'blogicum-cache'
+))
+
+# Workers of a node share the file-based level of the cache and keep the
+# most used version-addressed entries (cached cards) in memory. Only keys
+# embedding versions of their sources and never rewritten may go to L1;
+# rendered pages are not among them, revalidation rewrites their keys.
+# Sessions with user snapshots and the state of the blog caches (versions,
+# counters, locks) have caches of their own, so culling of rendered pages
+# never evicts them.
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.TwoLevelCache',
+        'LOCATION': CACHE_DIR / 'pages',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'L1_MAX_ENTRIES': 1000,
+            'L1_KEY_PREFIXES': ('template.cache.',),
+        },
+    },
+    'state': {
+        'BACKEND': 'core.cache.LockedFileBasedCache',
+        'LOCATION': CACHE_DIR / 'state',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        },
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'sessions',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        },
+    },
+    # Posts and authors that were not found. Every junk URL adds an entry,
+    # so they are culled among themselves.
+    'missing': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR / 'missing',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+}
+
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Sessions are read from the cache and written through to the database.
+# Sessions stored before the switch are still found in the database, so
+# nobody is logged out. signed_cookies would also skip the database, but
+# it logs out everyone when enabled and makes sessions unrevocable.
+# Delete expired sessions with the clear_expired_sessions command.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Compile every template of TEMPLATES DIRS when a WSGI worker starts.
+# Enabled in settings_prod together with the cached template loader.
+WARM_UP_TEMPLATES = False
+
+# Render error pages for anonymous visitors once per process and serve
+# them from memory. Enabled in settings_prod.
+PRERENDER_ERROR_PAGES = False
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
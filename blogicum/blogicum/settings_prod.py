@@ -0,0 +1,28 @@
+from .settings import *  # noqa: F401, F403
+from .settings import INSTALLED_APPS, TEMPLATES
+
+DEBUG = False
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+
+# Templates are parsed once per process and kept by the cached loader, so
+# they must be compiled before workers accept traffic (see wsgi.py).
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+WARM_UP_TEMPLATES = True
+
+PRERENDER_ERROR_PAGES = True
@@ -9,8 +9,17 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+if settings.WARM_UP_TEMPLATES:
+    from core.warmup import warm_templates
+    warm_templates()
+
+if settings.PRERENDER_ERROR_PAGES:
+    from pages.views import prerender_error_pages
+    prerender_error_pages()
@@ -0,0 +1,98 @@
+"""
+Cached resolution of the logged in user.
+
+Snapshots of user rows are kept in the session cache, which is shared by
+all workers like the sessions themselves, so a password change or a
+deactivation is seen by every process. A snapshot holds the few fields
+pages need and the session auth hash, never the password hash itself.
+Signals forget the snapshot when the user is saved or deleted.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+)
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import router
+from django.utils.crypto import constant_time_compare
+
+from core.consts import USER_CACHE_TIMEOUT
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+SNAPSHOT_FIELDS = ('first_name', 'last_name', 'is_active')
+
+
+def user_cache():
+    return caches[settings.SESSION_CACHE_ALIAS]
+
+
+def user_key(pk):
+    return f'core:user:{pk}'
+
+
+def forget_user(pk):
+    user_cache().delete(user_key(pk))
+
+
+def snapshot_fields(user_model):
+    """
+    Fields kept in the snapshot: the ones templates and permission checks
+    of the blog use. Others, like the password hash, are loaded on access
+    """
+    names = {
+        user_model._meta.pk.attname,
+        user_model.USERNAME_FIELD,
+        *SNAPSHOT_FIELDS
+    }
+    return [
+        field.attname for field in user_model._meta.concrete_fields
+        if field.attname in names
+    ]
+
+
+def load_user(pk):
+    """
+    Return active user by primary key and its session auth hash,
+    from the snapshot if possible
+    """
+    User = get_user_model()
+    names = snapshot_fields(User)
+    snapshot = user_cache().get(user_key(pk))
+    if snapshot is not None:
+        values, session_hash = snapshot
+        user = User.from_db(router.db_for_read(User), names, values)
+        return user, session_hash
+    user = User._default_manager.filter(pk=pk).first()
+    if user is None or not ModelBackend().user_can_authenticate(user):
+        return None, None
+    session_hash = user.get_session_auth_hash()
+    user_cache().set(
+        user_key(pk),
+        ([getattr(user, name) for name in names], session_hash),
+        USER_CACHE_TIMEOUT
+    )
+    return user, session_hash
+
+
+def get_user(request):
+    """
+    Same as django.contrib.auth.get_user for sessions of ModelBackend,
+    which are resolved from the snapshot. Everything unusual, including
+    snapshots not matching the session, is left to Django
+    """
+    session = request.session
+    if (
+        SESSION_KEY not in session
+        or session.get(BACKEND_SESSION_KEY) != MODEL_BACKEND
+        or MODEL_BACKEND not in settings.AUTHENTICATION_BACKENDS
+    ):
+        return auth.get_user(request)
+    user, session_hash = load_user(
+        get_user_model()._meta.pk.to_python(session[SESSION_KEY])
+    )
+    if user is None or not constant_time_compare(
+        session.get(HASH_SESSION_KEY, ''), session_hash
+    ):
+        return auth.get_user(request)
+    return user
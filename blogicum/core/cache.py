@@ -0,0 +1,216 @@
+"""
+Two-level cache shared by the worker processes of a node.
+
+The shared level is a file-based cache that every worker reads and
+writes, so values survive restarts and writes of one worker are seen by
+all of them. In front of it each process keeps a bounded LRU of entries
+whose keys start with one of L1_KEY_PREFIXES. Only keys that embed the
+versions of what they were built from and are written once belong there:
+an invalidation bumps a version in the shared level, which makes every
+worker build new keys. Everything else, like pages rewritten under the
+same key when they are revalidated, is always read from the shared level.
+
+Hits and misses of both levels are counted per process and added to
+shared counters every STATS_FLUSH_EVERY lookups, see stats().
+
+FileBasedCache implements add() as has_key() followed by set() and incr()
+as get() followed by set() with the default timeout. LockedFileBasedCache
+runs both under a lock file shared by the processes, so add() can be used
+as a lock and counters keep their expiry.
+"""
+import os
+import pickle
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import locks
+from django.utils.connection import ConnectionProxy
+
+STATS_PREFIX = 'core:cache-stats:'
+STATS_NAMES = ('l1.hit', 'l1.miss', 'l2.hit', 'l2.miss')
+STATS_FLUSH_EVERY = 100
+LOCK_FILENAME = 'atomic.lock'
+
+# Versions, counters, locks and leases. They are small, shared by all
+# workers and must not be culled together with rendered pages.
+STATE_CACHE_ALIAS = 'state'
+state_cache = ConnectionProxy(caches, STATE_CACHE_ALIAS)
+
+
+def initial_version():
+    # Versions that fell out of the cache restart from the current time,
+    # so keys built with an older version never become reachable again.
+    return time.time_ns()
+
+
+class LockedFileBasedCache(FileBasedCache):
+    """FileBasedCache with add() and incr() atomic across processes"""
+
+    @contextmanager
+    def _locked(self):
+        self._createdir()
+        with open(os.path.join(self._dir, LOCK_FILENAME), 'ab') as file:
+            locks.lock(file, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(file)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._locked():
+            return super().add(key, value, timeout, version)
+
+    def _read(self, key, version):
+        """Expiry and value of the key, or None when it is missing"""
+        try:
+            with open(self._key_to_file(key, version), 'rb') as file:
+                expiry = pickle.load(file)
+                if expiry is not None and expiry < time.time():
+                    return None
+                return expiry, pickle.loads(zlib.decompress(file.read()))
+        except (FileNotFoundError, EOFError):
+            return None
+
+    def incr(self, key, delta=1, version=None):
+        with self._locked():
+            entry = self._read(key, version)
+            if entry is None:
+                raise ValueError(f"Key '{key}' not found")
+            expiry, value = entry
+            value += delta
+            timeout = None if expiry is None else expiry - time.time()
+            self.set(key, value, timeout, version)
+            return value
+
+
+class TwoLevelCache(BaseCache):
+    """
+    Process-local LRU in front of FileBasedCache. Extra OPTIONS:
+    L1_MAX_ENTRIES, L1_TIMEOUT and L1_KEY_PREFIXES
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared = LockedFileBasedCache(location, params)
+        self.l1_max_entries = options.get('L1_MAX_ENTRIES', 1000)
+        self.l1_timeout = options.get('L1_TIMEOUT', 60)
+        self.l1_key_prefixes = tuple(options.get('L1_KEY_PREFIXES', ()))
+        self._l1 = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(STATS_NAMES, 0)
+        self._lookups = 0
+
+    def _in_l1(self, key):
+        return key.startswith(self.l1_key_prefixes)
+
+    def _l1_get(self, key, version):
+        l1_key = self.make_key(key, version)
+        with self._lock:
+            entry = self._l1.get(l1_key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._l1[l1_key]
+                return None
+            self._l1.move_to_end(l1_key)
+            return value
+
+    def _l1_set(self, key, value, timeout, version):
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is not None:
+            timeout = min(timeout - time.time(), self.l1_timeout)
+        else:
+            timeout = self.l1_timeout
+        l1_key = self.make_key(key, version)
+        with self._lock:
+            self._l1[l1_key] = (time.monotonic() + timeout, value)
+            self._l1.move_to_end(l1_key)
+            while len(self._l1) > self.l1_max_entries:
+                self._l1.popitem(last=False)
+
+    def _l1_delete(self, key, version):
+        with self._lock:
+            self._l1.pop(self.make_key(key, version), None)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+            self._lookups += 1
+            if self._lookups < STATS_FLUSH_EVERY:
+                return
+            stats = self._stats
+            self._stats = dict.fromkeys(STATS_NAMES, 0)
+            self._lookups = 0
+        self._flush_stats(stats)
+
+    def _flush_stats(self, stats):
+        for name, value in stats.items():
+            if not value:
+                continue
+            key = STATS_PREFIX + name
+            self.shared.add(key, 0, None)
+            try:
+                self.shared.incr(key, value)
+            except ValueError:
+                self.shared.add(key, value, None)
+
+    def stats(self):
+        """Hits and misses per level, shared ones plus unflushed local"""
+        with self._lock:
+            local = dict(self._stats)
+        shared = self.shared.get_many([STATS_PREFIX + name for name in local])
+        return {
+            name: shared.get(STATS_PREFIX + name, 0) + value
+            for name, value in local.items()
+        }
+
+    def get(self, key, default=None, version=None):
+        if self._in_l1(key):
+            value = self._l1_get(key, version)
+            if value is not None:
+                self._count('l1.hit')
+                return value
+            self._count('l1.miss')
+        value = self.shared.get(key, version=version)
+        self._count('l2.miss' if value is None else 'l2.hit')
+        if value is None:
+            return default
+        if self._in_l1(key):
+            self._l1_set(key, value, self.l1_timeout, version)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version)
+        if self._in_l1(key):
+            self._l1_set(key, value, timeout, version)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.add(key, value, timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version)
+
+    def delete(self, key, version=None):
+        self._l1_delete(key, version)
+        return self.shared.delete(key, version)
+
+    def has_key(self, key, version=None):
+        if self._in_l1(key) and self._l1_get(key, version) is not None:
+            return True
+        return self.shared.has_key(key, version)  # noqa: W601
+
+    def incr(self, key, delta=1, version=None):
+        return self.shared.incr(key, delta, version)
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+        self.shared.clear()
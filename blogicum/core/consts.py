@@ -1,3 +1,33 @@
 MAX_LENGTH = 256
 
 POSTS_ON_PAGE = 10
+
+COMMENTS_ON_PAGE = 50
+
+POST_COUNT_CACHE_TIMEOUT = 60
+
+EXCERPT_WORDS = 10
+
+PAGE_CACHE_TIMEOUT = 300
+
+CARD_CACHE_TIMEOUT = 3600
+
+REGISTRY_MAX_SIZE = 1000
+
+REGISTRY_TIMEOUT = 300
+
+USER_CACHE_TIMEOUT = 300
+
+MISSING_CACHE_TIMEOUT = 60
+
+PAGE_LEASE_TIMEOUT = 30
+
+PAGE_LEASE_WAIT = 3
+
+LAST_GOOD_PAGE_TIMEOUT = 24 * 60 * 60
+
+LAST_GOOD_PAGE_REFRESH = 60
+
+THUMBNAIL_WIDTHS = (320, 640, 1280)
+
+THUMBNAIL_QUALITY = 85
@@ -0,0 +1,71 @@
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+
+ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+
+def browse(cookies, path, requests):
+    client = Client(HTTP_HOST='localhost')
+    client.cookies = copy.deepcopy(cookies)
+    try:
+        return sum(
+            client.get(path).status_code >= 400 for _ in range(requests)
+        )
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare session engines under concurrent logged in requests. '
+        'Uses the configured database and a temporary user'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engine', choices=ENGINES, action='append')
+        parser.add_argument('--path', default='/')
+        parser.add_argument('--clients', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=50)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create_user(
+            f'session-benchmark-{uuid4().hex[:8]}'
+        )
+        try:
+            for name in options['engine'] or ENGINES:
+                with override_settings(SESSION_ENGINE=ENGINES[name]):
+                    self.stdout.write(f'{name}: {self.run(user, options)}')
+        finally:
+            user.delete()
+
+    def run(self, user, options):
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(user)
+        total = options['clients'] * options['requests']
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['clients']) as executor:
+            futures = [
+                executor.submit(
+                    browse, client.cookies, options['path'],
+                    options['requests']
+                )
+                for _ in range(options['clients'])
+            ]
+            errors = sum(future.result() for future in futures)
+        elapsed = time.perf_counter() - started
+        client.logout()
+        return (
+            f'{total} requests in {elapsed:.2f} s, '
+            f'{total / elapsed:.0f} requests/s, {errors} errors'
+        )
@@ -0,0 +1,16 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Print hit rates of both levels of the shared cache'
+
+    def handle(self, *args, **options):
+        if not hasattr(cache, 'stats'):
+            raise CommandError('The default cache is not a TwoLevelCache')
+        stats = cache.stats()
+        for level in ('l1', 'l2'):
+            hits = stats[f'{level}.hit']
+            lookups = hits + stats[f'{level}.miss']
+            rate = f'{hits / lookups:.1%}' if lookups else '-'
+            self.stdout.write(f'{level}: {hits}/{lookups} hits ({rate})')
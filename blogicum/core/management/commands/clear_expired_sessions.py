@@ -0,0 +1,40 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired sessions in small batches, unlike clearsessions, '
+        'which deletes them in one long write'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of sessions deleted per query.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not hasattr(store, 'get_model_class'):
+            # Sessions outside the database expire on their own.
+            store.clear_expired()
+            return
+        sessions = store.get_model_class().objects
+        now = timezone.now()
+        deleted = 0
+        while True:
+            batch = list(
+                sessions.filter(expire_date__lt=now).values_list(
+                    'session_key', flat=True
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            deleted += sessions.filter(session_key__in=batch).delete()[0]
+        self.stdout.write(f'Expired sessions deleted: {deleted}')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from core.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile all project templates and compare the first compilation '
+        'with the lookups that follow it'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        count, cold = warm_templates()
+        self.stdout.write(
+            f'Compiled {count} templates in {cold * 1000:.1f} ms'
+        )
+        warm = sum(
+            warm_templates()[1] for _ in range(options['repeat'])
+        ) / options['repeat']
+        self.stdout.write(
+            f'Loaded them again in {warm * 1000:.1f} ms on average'
+        )
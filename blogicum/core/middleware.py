@@ -0,0 +1,12 @@
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.functional import SimpleLazyObject
+
+from core.auth import get_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """Set request.user from the cached user snapshot"""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
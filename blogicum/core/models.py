@@ -1,25 +1,50 @@
+from django.conf import settings
 from django.db import models
+from django.template.defaultfilters import linebreaksbr
 
 
 class BaseModel(models.Model):
     """
-    Абстрактная модель. Добавляет поле
+    Абстрактная модель. Добавляет поля
     created_at - дату и время добавления объекта в базу данных
+    и updated_at - дату и время его последнего изменения
     """
 
     created_at = models.DateTimeField(
         'Добавлено',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True
+    )
 
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember loaded values, so changes can be detected on save"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'updated_at'}
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
 
 class BaseModelPublished(BaseModel):
     """
     Абстрактная модель. Наследник модели BaseModel.
-    Наследует поле created_at и добавляет флаг is_published
+    Наследует поля created_at, updated_at и добавляет флаг is_published
     """
 
     is_published = models.BooleanField(
@@ -30,3 +55,35 @@ class BaseModelPublished(BaseModel):
 
     class Meta:
         abstract = True
+
+
+class BaseModelRenderedText(models.Model):
+    """
+    Абстрактная модель. Добавляет поле text_html - HTML-версию поля text
+    наследника, которая пересчитывается только при изменении текста.
+    При выключенной настройке BLOG_TEXT_HTML поле остаётся пустым,
+    и шаблоны форматируют text сами
+    """
+
+    text_html = models.TextField(editable=False, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def text_changed(self):
+        if 'text' not in self.__dict__:
+            return False
+        loaded_values = getattr(self, '_loaded_values', {})
+        return loaded_values.get('text') != self.text or (
+            settings.BLOG_TEXT_HTML and not self.text_html
+        )
+
+    def save(self, *args, **kwargs):
+        if self.text_changed():
+            self.text_html = (
+                linebreaksbr(self.text) if settings.BLOG_TEXT_HTML else ''
+            )
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'text' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'text_html'}
+        super().save(*args, **kwargs)
@@ -1,6 +1,22 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
+from django.utils.cache import patch_vary_headers
+from django.utils.html import escape
 from django.views.generic import TemplateView
 
+ERROR_TEMPLATES = {
+    403: 'pages/403csrf.html',
+    404: 'pages/404.html',
+    500: 'pages/500.html',
+}
+
+# Stands in for the address of the request in prerendered pages.
+URL_MARKER = 'prerendered-request-url'
+
+_prerendered = {}
+
 
 class About(TemplateView):
     template_name = 'pages/about.html'
@@ -10,13 +26,55 @@ class Rules(TemplateView):
     template_name = 'pages/rules.html'
 
 
+class PrerenderRequest(HttpRequest):
+    """Request of an anonymous visitor whose address is filled in later"""
+
+    user = AnonymousUser()
+
+    def build_absolute_uri(self, location=None):
+        return URL_MARKER
+
+
+def prerender_error_pages():
+    """Render error pages for anonymous visitors once per process"""
+    request = PrerenderRequest()
+    for status, template_name in ERROR_TEMPLATES.items():
+        _prerendered[status] = render(
+            request, template_name, status=status
+        ).content
+
+
+def error_page(request, status):
+    """
+    Serve the prerendered page when PRERENDER_ERROR_PAGES is on. Logged in
+    users see their own header, except on 500, which must not need the
+    database
+    """
+    user = getattr(request, 'user', None)
+    if not settings.PRERENDER_ERROR_PAGES or (
+        status != 500 and user is not None and user.is_authenticated
+    ):
+        return render(request, ERROR_TEMPLATES[status], status=status)
+    if not _prerendered:
+        prerender_error_pages()
+    response = HttpResponse(
+        _prerendered[status].replace(
+            URL_MARKER.encode(),
+            escape(request.build_absolute_uri()).encode()
+        ),
+        status=status
+    )
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
 def csrf_failure(request, reason=''):
-    return render(request, 'pages/403csrf.html', status=403)
+    return error_page(request, 403)
 
 
 def page_not_found(request, exception):
-    return render(request, 'pages/404.html', status=404)
+    return error_page(request, 404)
 
 
 def server_error(request):
-    return render(request, 'pages/500.html', status=500)
+    return error_page(request, 500)
@@ -33,6 +33,10 @@ class PostModelAdapter(StudentModelAdapter):
             "author",
             "category",
             "location",
+            "excerpt",
+            "text_html",
+            "updated_at",
+            "image_width",
             "refresh_from_db",
         ]
 
@@ -4,6 +4,7 @@ import time
 from http import HTTPStatus
 from inspect import getsource
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from typing import (
     Iterable,
     Type,
@@ -18,7 +19,10 @@ from typing import (
 
 import pytest
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +45,42 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def run_on_commit(request, monkeypatch):
+    # Tests wrapped in a transaction never commit: run on_commit()
+    # callbacks at once, as in autocommit mode.
+    marker = request.node.get_closest_marker("django_db")
+    if marker is None or marker.kwargs.get("transaction"):
+        return
+    monkeypatch.setattr(
+        transaction, "on_commit", lambda func, using=None: func()
+    )
+
+
+def pytest_configure(config):
+    # Tests clear every cache: keep them apart from the caches of a dev
+    # server on the same machine and of other test runs. Set up before
+    # collection, which already creates caches imported by test modules.
+    config.cache_dir = TemporaryDirectory(prefix="blogicum-cache-")
+    config.cache_settings = override_settings(CACHES={
+        alias: {**options, "LOCATION": Path(config.cache_dir.name) / alias}
+        for alias, options in settings.CACHES.items()
+    })
+    config.cache_settings.enable()
+
+
+def pytest_unconfigure(config):
+    config.cache_settings.disable()
+    config.cache_dir.cleanup()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -92,6 +132,7 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.feeds",
     "adapters.comment",
 ]
 
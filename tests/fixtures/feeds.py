@@ -0,0 +1,51 @@
+from datetime import timedelta
+from typing import List, Tuple
+
+import pytest
+from django.db.models import Model
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def feed_posts(
+        mixer: Mixer, user: Model, published_category: Model,
+        published_location: Model
+) -> List[Model]:
+    """
+    Published posts of one author, category and location, filling a page
+    and a short second one. Pairs of posts share a publication date to
+    exercise the id tiebreak of cursors
+    """
+    now = timezone.now()
+    return mixer.cycle(N_PER_PAGE + 3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=mixer.sequence(
+            *(
+                now - timedelta(days=1, hours=i // 2)
+                for i in range(N_PER_PAGE + 3)
+            )
+        ),
+    )
+
+
+@pytest.fixture
+def feed_post(feed_posts: List[Model]) -> Model:
+    """The newest post of the feeds, shown on their first pages"""
+    return feed_posts[0]
+
+
+@pytest.fixture
+def feed_urls(feed_post: Model) -> Tuple[str, ...]:
+    """Index, category and profile feeds showing feed_post"""
+    return (
+        "/",
+        f"/category/{feed_post.category.slug}/",
+        f"/profile/{feed_post.author.username}/",
+    )
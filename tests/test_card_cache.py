@@ -0,0 +1,48 @@
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from blog.cache import attach_card_versions
+
+pytestmark = [pytest.mark.django_db]
+
+
+def card_key(post):
+    attach_card_versions([post])
+    return make_template_fragment_key(
+        "post_card", (post.id, post.comment_count, post.card_version)
+    )
+
+
+def test_cards_are_cached_and_invalidated(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    assert cache.get(card_key(post)) is not None, (
+        "Убедитесь, что карточка публикации на главной странице кешируется."
+    )
+
+    post.title = "Новый заголовок карточки"
+    post.save()
+    response = user_client.get("/")
+    assert "Новый заголовок карточки" in response.content.decode(), (
+        "Убедитесь, что после изменения публикации её карточка"
+        " перестраивается."
+    )
+
+    location = post.location
+    location.name = "Новое место карточки"
+    location.save()
+    response = user_client.get("/")
+    assert "Новое место карточки" in response.content.decode(), (
+        "Убедитесь, что после изменения местоположения карточки публикаций"
+        " перестраиваются."
+    )
+
+    post.comments.create(author=post.author, text="Комментарий")
+    response = user_client.get("/")
+    assert "Комментарии (1)" in response.content.decode(), (
+        "Убедитесь, что после добавления комментария карточка публикации"
+        " показывает новое число комментариев."
+    )
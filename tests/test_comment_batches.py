@@ -0,0 +1,57 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from core.consts import COMMENTS_ON_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    comments = mixer.cycle(COMMENTS_ON_PAGE + 5).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    created_at = timezone.now() - timedelta(days=1)
+    for i, comment in enumerate(comments):
+        # Pairs of comments share a timestamp to exercise the id tiebreak.
+        type(comment).objects.filter(pk=comment.pk).update(
+            created_at=created_at + timedelta(minutes=i // 2)
+        )
+    return comments
+
+
+def test_detail_page_shows_first_batch(client, many_comments):
+    post_id = many_comments[0].post_id
+    response = client.get(f"/posts/{post_id}/")
+    context_ids = [comment.id for comment in response.context["comments"]]
+    assert context_ids == [c.id for c in many_comments[:COMMENTS_ON_PAGE]], (
+        "Убедитесь, что на странице публикации выводится только первая"
+        " порция комментариев, от старых к новым."
+    )
+    assert response.context["comments_next"]
+
+
+def test_load_more_returns_next_batch(client, many_comments):
+    post_id = many_comments[0].post_id
+    after = client.get(f"/posts/{post_id}/").context["comments_next"]
+    response = client.get(f"/posts/{post_id}/comments/?after={after}")
+    assert response.status_code == HTTPStatus.OK
+    assert [c.id for c in response.context["comments"]] == [
+        c.id for c in many_comments[COMMENTS_ON_PAGE:]
+    ], (
+        "Убедитесь, что ссылка «Показать ещё» возвращает следующую порцию"
+        " комментариев."
+    )
+    assert response.context["comments_next"] is None
+    assert "<html" not in response.content.decode("utf-8")
+
+
+def test_load_more_respects_post_visibility(client, many_comments):
+    post = many_comments[0].post
+    post.is_published = False
+    post.save()
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
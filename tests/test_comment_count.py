@@ -0,0 +1,96 @@
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при добавлении комментария счётчик комментариев"
+        " публикации увеличивается."
+    )
+
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при удалении комментария счётчик комментариев"
+        " публикации уменьшается."
+    )
+
+    post.comments.all().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что массовое удаление комментариев обновляет счётчик"
+        " комментариев публикации."
+    )
+
+
+def test_comment_count_follows_moved_comment(
+        mixer, post_with_published_location, post_with_another_category
+):
+    comment = mixer.blend("blog.Comment", post=post_with_published_location)
+    comment = type(comment).objects.get(pk=comment.pk)
+    comment.post = post_with_another_category
+    comment.save()
+    post_with_published_location.refresh_from_db()
+    post_with_another_category.refresh_from_db()
+    assert (
+        post_with_published_location.comment_count,
+        post_with_another_category.comment_count,
+    ) == (0, 1), (
+        "Убедитесь, что при переносе комментария в другую публикацию"
+        " счётчики обеих публикаций обновляются."
+    )
+
+
+def test_reconcile_comment_counts(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=10)
+
+    call_command("reconcile_comment_counts", batch_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что команда `reconcile_comment_counts` исправляет"
+        " расхождение счётчика с числом комментариев."
+    )
+
+
+@pytest.mark.parametrize("comments", (1, 50))
+def test_post_deletion_does_not_touch_each_comment(
+        mixer, post_with_published_location, django_assert_max_num_queries,
+        comments
+):
+    post = post_with_published_location
+    mixer.cycle(comments).blend("blog.Comment", post=post)
+    with django_assert_max_num_queries(6):
+        post.delete()
+    assert not type(post).objects.filter(pk=post.pk).exists(), (
+        "Убедитесь, что при удалении публикации её комментарии не обновляют"
+        " счётчик и ленты по одному."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_versions_are_bumped_once_per_transaction(
+        monkeypatch, mixer, post_with_published_location
+):
+    bumps = []
+    monkeypatch.setattr(
+        "blog.signals.bump_versions",
+        lambda namespaces: bumps.append(set(namespaces))
+    )
+    with transaction.atomic():
+        mixer.cycle(3).blend(
+            "blog.Comment", post=post_with_published_location
+        )
+        assert not bumps
+    assert len(bumps) == 1, (
+        "Убедитесь, что версии кэша за одну транзакцию сбрасываются"
+        " одним вызовом после её фиксации."
+    )
@@ -0,0 +1,64 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def page_urls(feed_post, feed_urls):
+    return (*feed_urls, f"/posts/{feed_post.id}/")
+
+
+@pytest.mark.parametrize("client_name", ("client", "user_client"))
+def test_unchanged_pages_are_not_modified(
+        request, feed_post, page_urls, client_name
+):
+    client = request.getfixturevalue(client_name)
+    # The first page with a form sets the CSRF cookie, a part of the ETag.
+    client.get(f"/posts/{feed_post.id}/")
+    for url in page_urls:
+        etag = client.get(url)["ETag"]
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что страница `{url}` отвечает статусом 304,"
+            " если она не изменилась с прошлого запроса."
+        )
+        assert response["ETag"] == etag
+
+
+@pytest.mark.parametrize(
+    "change", ("post", "comment", "category", "location", "author")
+)
+def test_changed_pages_are_sent_again(
+        user_client, feed_post, page_urls, change
+):
+    user_client.get(f"/posts/{feed_post.id}/")
+    etags = {url: user_client.get(url)["ETag"] for url in page_urls}
+    if change == "comment":
+        feed_post.comments.create(author=feed_post.author, text="Текст")
+    elif change == "author":
+        feed_post.author.first_name = "Новое имя"
+        feed_post.author.save()
+    else:
+        instance = feed_post if change == "post" else getattr(
+            feed_post, change
+        )
+        instance.save()
+    for url, etag in etags.items():
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Убедитесь, что после изменения ({change}) страница `{url}`"
+            " отдаётся заново."
+        )
+
+
+def test_detail_page_has_last_modified(client, feed_post):
+    last_modified = client.get(f"/posts/{feed_post.id}/")["Last-Modified"]
+    response = client.get(
+        f"/posts/{feed_post.id}/", HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что страница публикации учитывает заголовок"
+        " `If-Modified-Since`."
+    )
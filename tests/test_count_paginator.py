@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.paginators import post_count_key
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    return [
+        query["sql"] for query in context.captured_queries
+        if query["sql"].startswith("SELECT COUNT(*)")
+    ]
+
+
+def test_count_is_taken_from_cache(client, feed_posts):
+    assert len(count_queries(client, "/")) == 1
+    assert count_queries(client, "/") == [], (
+        "Убедитесь, что число публикаций для пагинации берётся из кэша."
+    )
+    assert cache.get(post_count_key("index")) == len(feed_posts)
+
+
+def test_count_cache_is_dropped_on_post_change(client, feed_posts):
+    client.get("/")
+    feed_posts[0].delete()
+    response = client.get("/")
+    assert response.context["page_obj"].paginator.count == (
+        len(feed_posts) - 1
+    ), "Убедитесь, что удаление публикации сбрасывает кэш числа публикаций."
+
+
+def test_stale_count_is_recounted_on_short_page(client, feed_posts):
+    cache.set(post_count_key("index"), N_PER_PAGE * 5)
+    response = client.get("/?page=2")
+    assert response.status_code == HTTPStatus.OK
+    page_obj = response.context["page_obj"]
+    assert len(page_obj) == len(feed_posts) - N_PER_PAGE
+    assert page_obj.paginator.num_pages == 2, (
+        "Убедитесь, что при устаревшем числе публикаций неполная страница"
+        " приводит к пересчёту."
+    )
+    assert cache.get(post_count_key("index")) == len(feed_posts)
+
+    cache.set(post_count_key("index"), N_PER_PAGE * 5)
+    assert client.get("/?page=4").status_code == HTTPStatus.NOT_FOUND
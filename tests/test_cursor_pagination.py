@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def walk_pages(client, url, direction):
+    pages = []
+    query = ""
+    while True:
+        page_obj = client.get(url + query).context["page_obj"]
+        pages.append([post.id for post in page_obj])
+        cursor = getattr(page_obj, f"{direction}_cursor")
+        if not cursor:
+            return pages
+        query = f"?{'after' if direction == 'next' else 'before'}={cursor}"
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pages_cover_feed_in_order(client, feed_posts):
+    pages = walk_pages(client, "/", "next")
+    expected = [
+        post.id
+        for post in sorted(
+            feed_posts, key=lambda p: (p.pub_date, p.id), reverse=True
+        )
+    ]
+    assert [post_id for page in pages for post_id in page] == expected, (
+        "Убедитесь, что переход по ссылкам `?after=` обходит все публикации"
+        " ленты по одному разу, от новых к старым."
+    )
+    assert all(len(page) <= N_PER_PAGE for page in pages)
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_before_cursor_returns_previous_page(client, feed_posts):
+    first_page = client.get("/").context["page_obj"]
+    second_page = client.get(
+        f"/?after={first_page.next_cursor}"
+    ).context["page_obj"]
+    back = client.get(
+        f"/?before={second_page.previous_cursor}"
+    ).context["page_obj"]
+    assert [p.id for p in back] == [p.id for p in first_page], (
+        "Убедитесь, что ссылка `?before=` возвращает предыдущую страницу."
+    )
+    assert not back.has_previous()
+
+
+def test_page_numbers_still_work(client, feed_posts):
+    with override_settings(BLOG_CURSOR_PAGINATION=True):
+        response = client.get("/?page=2")
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["page_obj"].number == 2, (
+        "Убедитесь, что ссылки вида `?page=` продолжают работать."
+    )
+
+
+def test_invalid_cursor_returns_404(client, feed_posts):
+    response = client.get("/?after=not-a-cursor")
+    assert response.status_code == HTTPStatus.NOT_FOUND
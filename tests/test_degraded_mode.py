@@ -0,0 +1,80 @@
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.core.cache import cache as django_cache
+from django.db import OperationalError
+
+from blog import cache, metrics
+from core.cache import state_cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def database_down():
+    return mock.patch(
+        "django.db.backends.utils.CursorWrapper.execute",
+        side_effect=OperationalError("database is locked"),
+    )
+
+
+def test_last_good_page_is_served(client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    rendered = client.get(url)
+    with database_down():
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что при недоступной базе данных страница публикации"
+        " отдаётся из последней удачной версии."
+    )
+    assert response.content == rendered.content
+    assert response["Warning"].startswith("110"), (
+        "Убедитесь, что устаревшая страница отдаётся с заголовком Warning."
+    )
+    assert metrics.snapshot()["degraded.served"] == 1, (
+        "Убедитесь, что отдача устаревших страниц учитывается в метриках."
+    )
+
+
+def test_database_error_without_last_good_page(
+        client, post_with_published_location
+):
+    with database_down(), pytest.raises(OperationalError):
+        client.get(f"/posts/{post_with_published_location.id}/")
+    assert metrics.snapshot()["degraded.missed"] == 1
+
+
+def test_pages_of_users_are_not_kept(
+        user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    user_client.get(url)
+    with database_down(), pytest.raises(OperationalError):
+        user_client.get(url)
+
+
+def test_unused_query_parameters_share_last_good_page(
+        client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    client.get(f"{url}?utm=1")
+    with database_down():
+        response = client.get(f"{url}?utm=2")
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что последняя удачная версия страницы хранится по"
+        " адресу без параметров, которые страница не использует."
+    )
+
+
+def test_pages_from_page_cache_are_not_stored_again(
+        client, post_with_published_location
+):
+    client.get("/")
+    key = cache.last_good_key("blog:index", "/")
+    django_cache.delete(key)
+    state_cache.delete(cache.LAST_GOOD_MARK_PREFIX + key)
+    client.get("/")
+    assert django_cache.get(key) is None, (
+        "Убедитесь, что страницы из кэша страниц не сохраняются повторно"
+        " как последние удачные версии."
+    )
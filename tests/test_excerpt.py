@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = " ".join(f"слово{i}" for i in range(1000))
+
+
+@pytest.fixture
+def long_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        text=LONG_TEXT,
+    )
+
+
+def test_excerpt_is_computed_on_save(long_post):
+    assert long_post.excerpt == " ".join(LONG_TEXT.split()[:10]) + " …", (
+        "Убедитесь, что при сохранении публикации вычисляется отрывок"
+        " из первых слов текста."
+    )
+
+
+def test_feed_does_not_load_full_text(client, long_post):
+    response = client.get("/")
+    assert LONG_TEXT not in response.content.decode("utf-8")
+    assert long_post.excerpt in response.content.decode("utf-8")
+    post = response.context["page_obj"][0]
+    assert "text" in post.get_deferred_fields(), (
+        "Убедитесь, что в ленте полный текст публикаций не загружается."
+    )
+
+
+def test_fill_post_excerpts(long_post):
+    Post.objects.update(excerpt="")
+    call_command("fill_post_excerpts", batch_size=1)
+    long_post.refresh_from_db()
+    assert long_post.excerpt.startswith("слово0 слово1")
@@ -0,0 +1,75 @@
+import re
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import RequestFactory
+
+from blog.models import Comment
+from blog.views import CategoryListView, PostListView, ProfileListView
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Проверяются планы запросов SQLite.",
+    ),
+]
+
+TABLE_SCAN = re.compile(r"SCAN (TABLE )?blog_(post|comment)\b")
+TEMP_SORT = "USE TEMP B-TREE"
+
+
+def get_view_queryset(view_class, user, **kwargs):
+    request = RequestFactory().get("/")
+    request.user = user
+    view = view_class()
+    view.setup(request, **kwargs)
+    return view.get_queryset()
+
+
+def assert_uses_index(queryset, page_name):
+    plan = queryset[:N_PER_PAGE].explain()
+    assert not TABLE_SCAN.search(plan) and TEMP_SORT not in plan, (
+        f"Убедитесь, что основной запрос {page_name} использует индекс,"
+        " а не полный просмотр таблицы с сортировкой во временном B-дереве."
+        f" План запроса:\n{plan}"
+    )
+
+
+def test_index_query_uses_index():
+    assert_uses_index(
+        get_view_queryset(PostListView, AnonymousUser()),
+        "главной страницы",
+    )
+
+
+def test_category_query_uses_index(published_category):
+    assert_uses_index(
+        get_view_queryset(
+            CategoryListView, AnonymousUser(), slug=published_category.slug
+        ),
+        "страницы категории",
+    )
+
+
+@pytest.mark.parametrize("as_author", (False, True))
+def test_profile_query_uses_index(user, as_author):
+    assert_uses_index(
+        get_view_queryset(
+            ProfileListView,
+            user if as_author else AnonymousUser(),
+            username=user.username,
+        ),
+        "страницы пользователя",
+    )
+
+
+def test_comments_query_uses_index(post_with_published_location):
+    assert_uses_index(
+        Comment.objects.filter(
+            post=post_with_published_location
+        ).select_related("author"),
+        "списка комментариев",
+    )
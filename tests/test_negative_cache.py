@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from blog.cache import missing_cache, missing_key
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("url", ("/posts/{id}/", "/profile/{username}/"))
+def test_missing_objects_are_remembered(
+        client, user, django_assert_num_queries, url
+):
+    url = url.format(id=user.pk + 100, username=f"{user.username}-new")
+    client.get(url)
+    with django_assert_num_queries(0):
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что отсутствующие публикации и пользователи"
+        " запоминаются и не ищутся в базе данных повторно."
+    )
+
+
+def test_missing_objects_have_own_cache(client):
+    client.get("/profile/crawler-junk/")
+    key = missing_key("author", "crawler-junk")
+    assert missing_cache.get(key) and cache.get(key) is None, (
+        "Убедитесь, что отсутствующие объекты запоминаются в отдельном"
+        " небольшом кэше и не вытесняют страницы, сессии и версии."
+    )
+
+
+def test_created_post_is_found(client, mixer, post_with_published_location):
+    post = post_with_published_location
+    missing_id = post.id + 1
+    client.get(f"/posts/{missing_id}/")
+    mixer.blend(
+        "blog.Post",
+        id=missing_id,
+        author=post.author,
+        category=post.category,
+        is_published=True,
+        pub_date=post.pub_date,
+    )
+    response = client.get(f"/posts/{missing_id}/")
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что созданная публикация перестаёт считаться"
+        " отсутствующей."
+    )
+
+
+def test_created_user_is_found(client, mixer):
+    client.get("/profile/new-user/")
+    mixer.blend("auth.User", username="new-user")
+    assert client.get("/profile/new-user/").status_code == HTTPStatus.OK
+
+
+def test_error_pages_are_prerendered(client, settings):
+    settings.DEBUG = False
+    settings.PRERENDER_ERROR_PAGES = True
+    client.get("/missing-page/")
+    response = client.get("/missing-page/?a=1&b=2")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.context is None, (
+        "Убедитесь, что страница 404 для анонимных посетителей не"
+        " рендерится заново для каждого запроса."
+    )
+    assert "/missing-page/?a=1&amp;b=2" in response.content.decode(), (
+        "Убедитесь, что на заранее отрендеренной странице 404 выводится"
+        " адрес запроса."
+    )
@@ -0,0 +1,197 @@
+import time
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.core.cache import caches
+from django.utils import timezone
+
+from blog import cache, metrics
+from core.cache import state_cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_pages_are_served_from_cache(
+        client, feed_urls, django_assert_num_queries
+):
+    for url in feed_urls:
+        first = client.get(url)
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second.content == first.content, (
+            "Убедитесь, что страницы лент для анонимных пользователей"
+            " отдаются из кэша."
+        )
+    snapshot = metrics.snapshot()
+    assert (snapshot["page_cache.hit"], snapshot["page_cache.miss"]) == (3, 3)
+
+
+def test_logged_in_pages_are_not_cached(user_client, feed_post):
+    user_client.get("/")
+    assert metrics.snapshot()["page_cache.miss"] == 0
+
+
+@pytest.mark.parametrize(
+    "change",
+    ("post", "comment", "category", "location"),
+)
+def test_cached_pages_are_invalidated(
+        client, mixer, feed_post, feed_urls, change
+):
+    for url in feed_urls:
+        client.get(url)
+    if change == "post":
+        feed_post.title = "Второй заголовок"
+        feed_post.save()
+        expected = "Второй заголовок"
+    elif change == "comment":
+        mixer.blend("blog.Comment", post=feed_post)
+        expected = "Комментарии (1)"
+    elif change == "category":
+        feed_post.category.title = "Новая категория"
+        feed_post.category.save()
+        expected = "Новая категория"
+    else:
+        feed_post.location.name = "Новое место"
+        feed_post.location.save()
+        expected = "Новое место"
+    for url in feed_urls:
+        assert expected in client.get(url).content.decode("utf-8"), (
+            f"Убедитесь, что изменение ({change}) сбрасывает кэш страницы"
+            f" {url}."
+        )
+
+
+def test_renamed_author_profile_is_not_served(client, feed_post):
+    author = feed_post.author
+    old_url = f"/profile/{author.username}/"
+    client.get(old_url)
+    author.username = "renamed"
+    author.save()
+    assert client.get(old_url).status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что после смены имени пользователя кэш страницы"
+        " профиля по старому имени сбрасывается."
+    )
+    assert client.get("/profile/renamed/").status_code == HTTPStatus.OK
+
+
+def test_deleted_category_posts_leave_cached_profile(client, feed_post):
+    url = f"/profile/{feed_post.author.username}/"
+    assert feed_post.title in client.get(url).content.decode("utf-8")
+    feed_post.category.delete()
+    assert feed_post.title not in client.get(url).content.decode("utf-8"), (
+        "Убедитесь, что удаление категории сбрасывает кэш страниц профилей"
+        " авторов её публикаций."
+    )
+
+
+def test_other_feeds_stay_cached(client, feed_post, another_user):
+    client.get("/")
+    client.get(f"/profile/{another_user.username}/")
+    feed_post.title = "Второй заголовок"
+    feed_post.save()
+    client.get(f"/profile/{another_user.username}/")
+    assert metrics.snapshot()["page_cache.hit"] == 1, (
+        "Убедитесь, что изменение публикации не сбрасывает кэш лент,"
+        " в которых она не показывается."
+    )
+
+
+def test_scheduled_post_appears_after_publication(
+        client, mixer, feed_post
+):
+    scheduled = mixer.blend(
+        "blog.Post",
+        author=feed_post.author,
+        category=feed_post.category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+        title="Отложенная публикация",
+    )
+    assert scheduled.title not in client.get("/").content.decode("utf-8")
+    later = scheduled.pub_date + timedelta(seconds=1)
+    with mock.patch("django.utils.timezone.now", return_value=later):
+        content = client.get("/").content.decode("utf-8")
+    assert scheduled.title in content, (
+        "Убедитесь, что отложенная публикация появляется в кэшированной"
+        " ленте, как только наступает время её публикации."
+    )
+
+
+def index_page_key():
+    return cache.page_key("blog:index", ("index",), "/")
+
+
+def test_stale_page_is_served_while_another_request_renders(
+        client, feed_post, django_assert_num_queries
+):
+    client.get("/")
+    title = feed_post.title
+    feed_post.title = "Второй заголовок"
+    feed_post.save()
+    # Another worker holds the lease of the new version of the page.
+    state_cache.add(cache.PAGE_LEASE_PREFIX + index_page_key(), 1)
+    with django_assert_num_queries(0):
+        content = client.get("/").content.decode("utf-8")
+    assert title in content, (
+        "Убедитесь, что пока новая версия страницы рендерится другим"
+        " запросом, остальные получают предыдущую версию из кэша."
+    )
+    assert metrics.snapshot()["page_cache.stale"] == 1
+
+
+def test_too_stale_page_is_not_served(client, feed_post, settings):
+    settings.BLOG_PAGE_MAX_STALENESS = 0
+    client.get("/")
+    feed_post.title = "Второй заголовок"
+    feed_post.save()
+    state_cache.add(cache.PAGE_LEASE_PREFIX + index_page_key(), 1)
+    with mock.patch.object(cache, "PAGE_LEASE_WAIT", 0.1):
+        content = client.get("/").content.decode("utf-8")
+    assert "Второй заголовок" in content, (
+        "Убедитесь, что копии старше `BLOG_PAGE_MAX_STALENESS` не отдаются."
+    )
+
+
+def test_waiting_request_gets_page_of_lease_holder(client, feed_post):
+    key = index_page_key()
+    state_cache.add(cache.PAGE_LEASE_PREFIX + key, 1)
+
+    def render_elsewhere(seconds):
+        cache.set_page(
+            key, cache.latest_page_key("blog:index", "/"), b"rendered", {}
+        )
+
+    with mock.patch.object(cache.time, "sleep", render_elsewhere):
+        response = client.get("/")
+    assert response.content == b"rendered", (
+        "Убедитесь, что одновременные промахи по одному ключу ждут"
+        " страницу, которую рендерит первый запрос."
+    )
+    assert metrics.snapshot()["page_cache.coalesced"] == 1
+
+
+def test_lease_is_released_after_error(client):
+    client.get("/category/missing/")
+    assert state_cache.add(
+        cache.PAGE_LEASE_PREFIX
+        + cache.page_key(
+            "blog:category_posts", ("category:missing",), "/category/missing/"
+        ),
+        1,
+    ), "Убедитесь, что при ошибке рендеринга блокировка страницы снимается."
+
+
+def test_page_revalidated_by_another_worker_is_served(client, feed_post):
+    client.get("/")
+    key = index_page_key()
+    # The shared level is what the other workers of the node write to.
+    caches["default"].shared.set(
+        key, (b"revalidated", {}, time.time()), cache.page_timeout()
+    )
+    assert client.get("/").content == b"revalidated", (
+        "Убедитесь, что страницы, перезаписанные другим процессом,"
+        " не отдаются из памяти процесса."
+    )
@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.registry import registry
+from core.auth import load_user
+
+pytestmark = [pytest.mark.django_db]
+
+def warm_caches(*users):
+    """Load what requests share through process-local and shared caches"""
+    registry.refresh()
+    for user in users:
+        load_user(user.pk)
+
+
+@pytest.fixture
+def feed_comment(mixer, user, feed_post):
+    return mixer.cycle(2).blend(
+        "blog.Comment", post=feed_post, author=user
+    )[0]
+
+
+@pytest.mark.parametrize(
+    ("url", "queries"),
+    (
+        ("/", 2),
+        ("/category/{category}/", 2),
+        ("/profile/{username}/", 3),
+        ("/posts/{post}/", 2),
+        ("/posts/{post}/edit/", 3),
+        ("/posts/{post}/delete/", 2),
+        ("/posts/{post}/edit_comment/{comment}/", 1),
+        ("/posts/{post}/delete_comment/{comment}/", 1),
+    ),
+)
+def test_view_queries(
+        user_client, user, feed_post, feed_comment,
+        django_assert_num_queries, url, queries
+):
+    url = url.format(
+        category=feed_post.category.slug,
+        username=user.username,
+        post=feed_post.id,
+        comment=feed_comment.id,
+    )
+    warm_caches(user)
+    with django_assert_num_queries(queries):
+        user_client.get(url)
+
+
+@pytest.mark.parametrize(
+    "url",
+    (
+        "/posts/{post}/edit/",
+        "/posts/{post}/delete/",
+        "/posts/{post}/edit_comment/{comment}/",
+        "/posts/{post}/delete_comment/{comment}/",
+    ),
+)
+def test_non_author_is_rejected_without_loading(
+        another_user, another_user_client, feed_post, feed_comment,
+        django_assert_num_queries, url
+):
+    url = url.format(post=feed_post.id, comment=feed_comment.id)
+    warm_caches(another_user)
+    # Failed lookup by author and existence check of the object.
+    with django_assert_num_queries(2):
+        response = another_user_client.get(url)
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def test_comment_of_another_post_is_not_found(
+        user_client, feed_comment, post_with_published_location
+):
+    response = user_client.get(
+        f"/posts/{post_with_published_location.id}"
+        f"/edit_comment/{feed_comment.id}/"
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что комментарий ищется только среди комментариев"
+        " публикации из адреса страницы."
+    )
+
+
+def test_comment_create_queries(
+        user, user_client, feed_post, django_assert_num_queries
+):
+    warm_caches(user)
+    # Visibility check, insert, comment counter update
+    # and lookup of the feeds to invalidate.
+    with django_assert_num_queries(4):
+        user_client.post(
+            f"/posts/{feed_post.id}/comment/", data={"text": "Комментарий"}
+        )
+    assert feed_post.comments.count() == 1
+
+
+def test_comment_to_unpublished_post_is_rejected(
+        another_user_client, feed_post
+):
+    feed_post.is_published = False
+    feed_post.save()
+    response = another_user_client.post(
+        f"/posts/{feed_post.id}/comment/", data={"text": "Комментарий"}
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что комментировать снятую с публикации публикацию"
+        " может только её автор."
+    )
+    assert not feed_post.comments.exists()
@@ -0,0 +1,65 @@
+import pytest
+from django.db import transaction
+
+from blog.cache import get_versions
+from blog.registry import NAMESPACE, Registry
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_registry_is_loaded_once(
+        published_category, django_assert_num_queries
+):
+    registry = Registry()
+    registry.refresh()
+    with django_assert_num_queries(0):
+        category = registry.category_by_slug(published_category.slug)
+    assert category == published_category, (
+        "Убедитесь, что категории берутся из реестра без запросов к базе."
+    )
+
+
+def test_registry_follows_changes(published_category):
+    registry = Registry()
+    registry.refresh()
+    published_category.is_published = False
+    published_category.save()
+    assert not registry.category_by_slug(
+        published_category.slug
+    ).is_published, (
+        "Убедитесь, что реестр перезагружается после изменения категории."
+    )
+
+
+def test_bounded_registry_falls_back_to_database(
+        mixer, post_with_published_location, django_assert_num_queries
+):
+    post = post_with_published_location
+    post.location = mixer.cycle(2).blend("blog.Location")[-1]
+    post.save()
+    registry = Registry(max_size=1)
+    registry.refresh()
+    posts = [type(post).objects.get(pk=post.pk)]
+    with django_assert_num_queries(1):
+        registry.attach(posts)
+        assert posts[0].location == post.location
+        assert posts[0].category == post.category
+
+
+def test_registry_expires(published_category, django_assert_num_queries):
+    registry = Registry(timeout=0)
+    registry.refresh()
+    with django_assert_num_queries(2):
+        registry.refresh()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_registry_version_is_bumped_after_commit(published_category):
+    version = get_versions((NAMESPACE,))
+    with transaction.atomic():
+        published_category.save()
+        assert get_versions((NAMESPACE,)) == version, (
+            "Убедитесь, что версия реестра меняется только после фиксации"
+            " транзакции, а не внутри неё."
+        )
+    assert get_versions((NAMESPACE,)) != version
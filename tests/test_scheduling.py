@@ -0,0 +1,75 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from blog.scheduling import (
+    EPOCH_KEY, get_frontier, posts_published, publication_epoch
+)
+from core.cache import state_cache
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def test_epoch_is_stable_until_publication(scheduled_post):
+    assert get_frontier() == scheduled_post.pub_date, (
+        "Убедитесь, что планировщик хранит время ближайшей отложенной"
+        " публикации."
+    )
+    assert publication_epoch() == publication_epoch()
+
+
+def test_epoch_changes_once_when_post_goes_live(scheduled_post):
+    epoch = publication_epoch()
+    published = []
+
+    def on_published(sender, posts, epoch, **kwargs):
+        published.append((list(posts), epoch))
+
+    posts_published.connect(on_published)
+    later = scheduled_post.pub_date + timedelta(seconds=1)
+    try:
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            new_epoch = publication_epoch()
+            assert publication_epoch() == new_epoch
+    finally:
+        posts_published.disconnect(on_published)
+
+    assert new_epoch == epoch + 1, (
+        "Убедитесь, что эпоха публикаций меняется, когда отложенная"
+        " публикация становится видна."
+    )
+    assert published == [([scheduled_post], new_epoch)], (
+        "Убедитесь, что сигнал `posts_published` отправляется один раз"
+        " с вышедшими публикациями."
+    )
+    assert get_frontier() is None
+
+
+def test_frontier_follows_post_changes(scheduled_post):
+    scheduled_post.pub_date = timezone.now() + timedelta(minutes=5)
+    scheduled_post.save()
+    assert get_frontier() == scheduled_post.pub_date
+    scheduled_post.delete()
+    assert get_frontier() is None
+
+
+def test_lost_epoch_is_not_reused(scheduled_post):
+    epoch = publication_epoch()
+    state_cache.delete(EPOCH_KEY)
+    assert publication_epoch() > epoch, (
+        "Убедитесь, что эпоха публикаций, вытесненная из кэша, не начинается"
+        " заново и старые ключи страниц не становятся снова актуальными."
+    )
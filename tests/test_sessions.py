@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore as DbStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_database_sessions_survive_engine_switch(client, user):
+    session = DbStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.save()
+    client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+    response = client.get("/")
+    assert response.context["user"] == user, (
+        "Убедитесь, что сессии, сохранённые в базе данных до смены"
+        " хранилища сессий, продолжают работать."
+    )
+
+
+def test_clear_expired_sessions_in_batches():
+    for days in (-2, -1, 1):
+        session = DbStore()
+        session.set_expiry(int(timedelta(days=days).total_seconds()))
+        session.save()
+    call_command("clear_expired_sessions", batch_size=1)
+    assert Session.objects.count() == 1, (
+        "Убедитесь, что команда `clear_expired_sessions` удаляет только"
+        " просроченные сессии."
+    )
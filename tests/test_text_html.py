@@ -0,0 +1,51 @@
+import pytest
+from django.test import override_settings
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_text_html_is_rendered_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = "<b>строка</b>\nвторая"
+    post.save()
+    assert post.text_html == "&lt;b&gt;строка&lt;/b&gt;<br>вторая", (
+        "Убедитесь, что при сохранении публикации в `text_html`"
+        " записывается экранированный текст с переносами строк."
+    )
+
+
+def test_text_html_is_kept_when_text_is_unchanged(
+        post_with_published_location
+):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    Post.objects.filter(pk=post.pk).update(text_html="сохранённый html")
+    post.refresh_from_db()
+    post.title = "Новый заголовок"
+    post.save()
+    post.refresh_from_db()
+    assert post.text_html == "сохранённый html", (
+        "Убедитесь, что `text_html` пересчитывается только при изменении"
+        " текста."
+    )
+
+
+def test_comment_html_is_shown(client, comment_to_a_post):
+    comment_to_a_post.text = "первая\nвторая"
+    comment_to_a_post.save()
+    response = client.get(f"/posts/{comment_to_a_post.post_id}/")
+    assert "первая<br>вторая" in response.content.decode("utf-8")
+
+
+@override_settings(BLOG_TEXT_HTML=False)
+def test_text_html_can_be_disabled(client, post_with_published_location):
+    post = post_with_published_location
+    post.text = "первая\nвторая"
+    post.save()
+    assert post.text_html == ""
+    response = client.get(f"/posts/{post.id}/")
+    assert "первая<br>вторая" in response.content.decode("utf-8"), (
+        "Убедитесь, что при выключенной настройке `BLOG_TEXT_HTML` текст"
+        " публикации форматируется в шаблоне."
+    )
@@ -0,0 +1,119 @@
+import os
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+def jpeg(name):
+    content = BytesIO()
+    Image.new("RGB", (1000, 500), "red").save(content, "JPEG")
+    return SimpleUploadedFile(
+        name, content.getvalue(), content_type="image/jpeg"
+    )
+
+
+@pytest.fixture
+def post_with_image(settings, tmp_path, post_with_published_location):
+    settings.MEDIA_ROOT = str(tmp_path)
+    post = post_with_published_location
+    post.image = jpeg("photo.jpg")
+    post.save()
+    return post
+
+
+def stored_images(tmp_path):
+    return sorted(os.listdir(tmp_path / "posts_images"))
+
+
+def test_thumbnails_are_created_on_save(post_with_image, tmp_path):
+    assert post_with_image.image_width == 1000
+    assert stored_images(tmp_path) == [
+        "photo.jpg", "photo_320w.jpg", "photo_640w.jpg"
+    ], (
+        "Убедитесь, что при сохранении публикации рядом с изображением"
+        " создаются его уменьшенные копии, не больше оригинала."
+    )
+    with Image.open(tmp_path / "posts_images" / "photo_320w.jpg") as image:
+        assert image.size == (320, 160)
+
+    post_with_image.title = "Новый заголовок"
+    post_with_image.save()
+    assert len(stored_images(tmp_path)) == 3, (
+        "Убедитесь, что повторное сохранение публикации не создаёт"
+        " копии изображения заново."
+    )
+
+
+def test_srcset_lists_thumbnails(client, post_with_image):
+    content = client.get(f"/posts/{post_with_image.id}/").content.decode()
+    assert (
+        'srcset="/media/posts_images/photo_320w.jpg 320w, '
+        "/media/posts_images/photo_640w.jpg 640w, "
+        '/media/posts_images/photo.jpg 1000w"'
+    ) in content, (
+        "Убедитесь, что в шаблоне публикации изображение выводится"
+        " с атрибутом srcset."
+    )
+
+
+def test_regenerate_thumbnails(post_with_image, tmp_path):
+    os.remove(tmp_path / "posts_images" / "photo_640w.jpg")
+    type(post_with_image).objects.update(image_width=None)
+
+    call_command("regenerate_thumbnails")
+
+    post_with_image.refresh_from_db()
+    assert post_with_image.image_width == 1000
+    assert "photo_640w.jpg" in stored_images(tmp_path), (
+        "Убедитесь, что команда `regenerate_thumbnails` создаёт"
+        " недостающие копии изображений."
+    )
+
+
+def test_replaced_image_thumbnails_are_deleted(post_with_image, tmp_path):
+    post_with_image.image = jpeg("other.jpg")
+    post_with_image.save()
+    assert not {"photo_320w.jpg", "photo_640w.jpg"} & set(
+        stored_images(tmp_path)
+    ), (
+        "Убедитесь, что при замене изображения публикации копии старого"
+        " изображения удаляются."
+    )
+    assert "other_320w.jpg" in stored_images(tmp_path)
+
+
+def test_deleted_post_thumbnails_are_deleted(post_with_image, tmp_path):
+    post_with_image.delete()
+    assert stored_images(tmp_path) == ["photo.jpg"], (
+        "Убедитесь, что при удалении публикации копии её изображения"
+        " удаляются."
+    )
+
+
+def test_corrupt_image_is_saved_without_thumbnails(
+        client, settings, tmp_path, post_with_published_location
+):
+    settings.MEDIA_ROOT = str(tmp_path)
+    content = jpeg("broken.jpg").read()
+    post = post_with_published_location
+    post.image = SimpleUploadedFile(
+        "broken.jpg", content[:len(content) // 2], content_type="image/jpeg"
+    )
+    post.save()
+    assert stored_images(tmp_path) == ["broken.jpg"], (
+        "Убедитесь, что повреждённое изображение сохраняется без копий"
+        " и не приводит к ошибке."
+    )
+    post.refresh_from_db()
+    assert post.image_width is None
+    content = client.get(f"/posts/{post.id}/").content.decode()
+    assert 'src="/media/posts_images/broken.jpg"' in content
+    assert "broken_320w" not in content and "broken_640w" not in content, (
+        "Убедитесь, что для повреждённого изображения страница ссылается"
+        " только на оригинал, а не на несуществующие копии."
+    )
@@ -0,0 +1,89 @@
+import multiprocessing
+import time
+from unittest import mock
+
+import pytest
+
+from core.cache import LockedFileBasedCache, TwoLevelCache
+
+
+@pytest.fixture
+def workers(tmp_path):
+    params = {
+        "OPTIONS": {"L1_MAX_ENTRIES": 2, "L1_KEY_PREFIXES": ("page:",)}
+    }
+    return (
+        TwoLevelCache(tmp_path, params), TwoLevelCache(tmp_path, params)
+    )
+
+
+def test_writes_are_shared_between_workers(workers):
+    first, second = workers
+    first.set("version", {"value": 1})
+    assert second.get("version") == {"value": 1}
+    first.set("version", {"value": 2})
+    assert second.get("version") == {"value": 2}, (
+        "Убедитесь, что ключи без версий всегда читаются из общего уровня"
+        " кеша и изменения одного процесса видны другим."
+    )
+
+
+def test_versioned_keys_are_kept_in_process(workers):
+    first, second = workers
+    first.set("page:1", "страница")
+    second.get("page:1")
+    second.shared.clear()
+    assert second.get("page:1") == "страница", (
+        "Убедитесь, что версионированные ключи кешируются в памяти процесса."
+    )
+    assert second.stats() == {
+        "l1.hit": 1, "l1.miss": 1, "l2.hit": 1, "l2.miss": 0
+    }
+
+
+def test_process_level_is_bounded(workers):
+    first, _ = workers
+    for number in range(3):
+        first.set(f"page:{number}", number)
+    first.shared.clear()
+    assert [first.get(f"page:{number}") for number in range(3)] == [
+        None, 1, 2
+    ], "Убедитесь, что кеш в памяти процесса вытесняет старые записи."
+
+
+def take_lease(location, barrier, results):
+    cache = LockedFileBasedCache(location, {})
+    barrier.wait()
+    results.put(cache.add("lease", 1, 30))
+
+
+def test_add_is_exclusive_between_processes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(8)
+    results = context.Queue()
+    processes = [
+        context.Process(target=take_lease, args=(tmp_path, barrier, results))
+        for _ in range(8)
+    ]
+    for process in processes:
+        process.start()
+    winners = sum(results.get(timeout=10) for _ in processes)
+    for process in processes:
+        process.join()
+    assert winners == 1, (
+        "Убедитесь, что `add` общего кеша выполняется атомарно и ключ"
+        " получает только один процесс."
+    )
+
+
+def test_incr_keeps_expiry(tmp_path):
+    cache = LockedFileBasedCache(tmp_path, {})
+    cache.set("version", 1, None)
+    cache.set("counter", 1, 10)
+    cache.incr("version")
+    cache.incr("counter")
+    with mock.patch("time.time", return_value=time.time() + 3600):
+        assert cache.get("version") == 2, (
+            "Убедитесь, что `incr` не ограничивает время жизни ключа."
+        )
+        assert cache.get("counter") is None
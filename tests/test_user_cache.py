@@ -0,0 +1,48 @@
+import pytest
+
+from core.auth import user_cache, user_key
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_user_is_resolved_from_cache(
+        user, user_client, django_assert_num_queries
+):
+    user_client.get("/")
+    with django_assert_num_queries(0):
+        assert user_client.get("/pages/about/").context["user"] == user
+
+
+def test_changed_user_is_reloaded(user, user_client):
+    user_client.get("/")
+    user.first_name = "Новое имя"
+    user.save()
+    response = user_client.get("/edit_profile/")
+    assert response.context["user"].first_name == "Новое имя", (
+        "Убедитесь, что после изменения профиля пользователь загружается"
+        " заново."
+    )
+
+
+@pytest.mark.parametrize("change", ("password", "deactivation"))
+def test_outdated_sessions_are_logged_out(user, user_client, change):
+    user_client.get("/")
+    if change == "password":
+        user.set_password("новый-пароль")
+    else:
+        user.is_active = False
+    user.save()
+    response = user_client.get("/")
+    assert not response.context["user"].is_authenticated, (
+        "Убедитесь, что после смены пароля или деактивации пользователя"
+        " его старые сессии больше не работают."
+    )
+
+
+def test_snapshot_does_not_keep_password_hash(user, user_client):
+    user_client.get("/")
+    values, session_hash = user_cache().get(user_key(user.pk))
+    assert user.password not in values, (
+        "Убедитесь, что хеш пароля не сохраняется в кэше пользователей."
+    )
+    assert session_hash == user.get_session_auth_hash()
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.template import engines
+from django.test import override_settings
+
+from blogicum import settings_prod
+
+
+def test_prod_settings_cache_templates():
+    loaders = settings_prod.TEMPLATES[0]["OPTIONS"]["loaders"]
+    assert loaders[0][0] == "django.template.loaders.cached.Loader", (
+        "Убедитесь, что в настройках для продакшена шаблоны кешируются."
+    )
+    assert not settings_prod.DEBUG
+
+
+def test_warm_templates_compiles_every_template(capsys):
+    templates = list(settings.TEMPLATES_DIR.rglob("*.html"))
+    with override_settings(TEMPLATES=settings_prod.TEMPLATES):
+        call_command("warm_templates", repeat=1)
+        loader = engines["django"].engine.template_loaders[0]
+        assert len(loader.get_template_cache) >= len(templates), (
+            "Убедитесь, что команда `warm_templates` компилирует все шаблоны"
+            " из каталога `templates/`."
+        )
+    assert f"Compiled {len(templates)} templates" in capsys.readouterr().out